@@ -7,14 +7,21 @@ from datetime import datetime, timedelta, date
 from faker import Faker
 import mysql.connector
 from mysql.connector import pooling, Error
-from concurrent.futures import ThreadPoolExecutor
 from collections import defaultdict
 import argparse
 import logging
+import re
 import sys
+import zlib
+from concurrent.futures import ProcessPoolExecutor
 from dotenv import load_dotenv
 from typing import List, Tuple, Dict, Any, Optional
 from dateutil.relativedelta import relativedelta
+import numpy as np
+
+import samplers
+from schedule_slots import SlotAllocator, classroom_names, days_between
+from unique_keys import CombinationSpace, UniqueCodes, UniqueNumbers
 
 load_dotenv()
 
@@ -28,6 +35,29 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Коды операторов для номеров телефонов
+PHONE_CODES = ['901', '902', '904', '908', '915', '916', '919', '920', '921', '922']
+
+# In-memory индексы: имя -> (запрос, группировать ли по первому столбцу).
+# Без группировки индекс отображает первый столбец в кортеж остальных,
+# с группировкой — в список значений второго столбца.
+INDEX_QUERIES = {
+    'courses': ("SELECT course_id, department_id, start_date FROM Courses", False),
+    'schedule': ("SELECT schedule_id, course_id, class_time FROM Schedule", False),
+    'teachers_by_department': ("SELECT department_id, teacher_id FROM Teachers", True),
+    'students_by_department': ("SELECT department_id, student_id FROM Students", True),
+    'enrollments_by_course': ("SELECT course_id, student_id FROM Enrollments", True),
+}
+
+# Статусы посещаемости: распределение samplers.ATTENDANCE_STATUS с англоязычными названиями
+ATTENDANCE_STATUS = samplers.ATTENDANCE_STATUS.relabel(['present', 'absent', 'excused', 'late'])
+ATTENDANCE_STATUSES = ATTENDANCE_STATUS.values
+
+# Число курсов/занятий в одной задаче пула процессов. Разбиение на задачи
+# не зависит от числа процессов, поэтому результат определяется только --seed
+TASK_SIZE = 50
+
+
 class DataGenerator:
     """
     Класс для генерации и заполнения базы данных тестовыми данными образовательного учреждения.
@@ -43,9 +73,10 @@ class DataGenerator:
         self.config = config
         self.fake = Faker('ru_RU')
         random.seed(config.seed)
-        self.cache = defaultdict(set)
-        self.used_phones = set()
+        self.email_codes = UniqueCodes(config.seed)
+        self.phone_numbers = UniqueNumbers(len(PHONE_CODES) * 10**7, config.seed)
         self.ids_cache = defaultdict(list)
+        self.index_cache = {}
 
         self.connection_pool = pooling.MySQLConnectionPool(
             pool_name="edu_pool",
@@ -139,7 +170,7 @@ class DataGenerator:
             batch.append((
                 first,
                 last,
-                self._generate_unique_value('emails', f"{first[0].lower()}.{last.lower()}@faculty.uni.ru"),
+                self._generate_email(first, last, 'faculty.uni.ru'),
                 self._generate_phone(),
                 random.choice(qualifications),
                 self.fake.date_between(start_date='-30y', end_date='-1y'),
@@ -155,6 +186,7 @@ class DataGenerator:
             desc="Вставка преподавателей"
         )
         self.ids_cache["teacher_ids"] = self._fetch_ids("SELECT teacher_id FROM Teachers")
+        self.index_cache.pop('teachers_by_department', None)
 
     def update_department_heads(self) -> None:
         """
@@ -162,8 +194,9 @@ class DataGenerator:
         """
         logger.info("Назначение деканов факультетов...")
         batch = []
+        teachers_by_department = self._index('teachers_by_department')
         for dept_id in self.ids_cache["department_ids"]:
-            teachers = self._fetch_ids(f"SELECT teacher_id FROM Teachers WHERE department_id = {dept_id}")
+            teachers = teachers_by_department.get(dept_id)
             if teachers:
                 batch.append((random.choice(teachers), dept_id))
 
@@ -199,7 +232,7 @@ class DataGenerator:
                 first,
                 last,
                 birth_date,
-                self._generate_unique_value('emails', f"{first[0].lower()}.{last.lower()}@student.uni.ru"),
+                self._generate_email(first, last, 'student.uni.ru'),
                 self._generate_phone(),
                 enroll_date,
                 random.choice(self.ids_cache["department_ids"]),
@@ -214,6 +247,7 @@ class DataGenerator:
             desc="Вставка студентов"
         )
         self.ids_cache["student_ids"] = self._fetch_ids("SELECT student_id FROM Students")
+        self.index_cache.pop('students_by_department', None)
 
     def generate_courses(self) -> None:
         """
@@ -248,6 +282,7 @@ class DataGenerator:
             desc="Вставка курсов"
         )
         self.ids_cache["course_ids"] = self._fetch_ids("SELECT course_id FROM Courses")
+        self.index_cache.pop('courses', None)
 
     def generate_schedule(self) -> None:
         """
@@ -256,31 +291,21 @@ class DataGenerator:
         logger.info("Генерация расписания...")
         batch = []
         timeslots = [('09:00', 90), ('11:00', 90), ('13:30', 90), ('15:30', 90), ('17:30', 120)]
-        used_schedule_entries = set()
+        slots = [(datetime.strptime(start_time, "%H:%M").time(), duration) for start_time, duration in timeslots]
+        days = days_between(self.config.academic_year["start"].date(), self.config.academic_year["end"].date(),
+                            weekdays_only=True)
+        # Занятость аудиторий и преподавателей: пары (classroom, class_time) не повторяются
+        allocator = SlotAllocator(classroom_names(5, range(100, 600)), self.config.seed, day_start=slots[0][0])
 
         courses = self._fetch_rows("SELECT course_id, teacher_id FROM Courses")
-
-        for _ in tqdm(range(self.config.num_schedule), desc="Создание расписания"):
-            course_id, teacher_id = random.choice(courses)
-            classroom = f"Корпус-{random.randint(1,5)} ауд-{random.randint(100, 599)}"
-            start_time, duration = random.choice(timeslots)
-
-            class_date = self.fake.date_between(
-                start_date=self.config.academic_year["start"],
-                end_date=self.config.academic_year["end"]
-            )
-
-            while class_date.weekday() >= 5:
-                class_date += timedelta(days=1)
-
-            class_time = datetime.combine(class_date, datetime.strptime(start_time, "%H:%M").time())
-
-            # Create a unique key for the schedule entry
-            schedule_entry_key = f"{classroom}-{class_time}"
-
-            # Check if the schedule entry is unique
-            if schedule_entry_key not in used_schedule_entries:
-                used_schedule_entries.add(schedule_entry_key)
+        # Число занятий каждого курса; курс занятия по-прежнему выбирается случайно
+        classes_per_course = defaultdict(int)
+        for _ in range(self.config.num_schedule if courses else 0):
+            classes_per_course[random.choice(courses)] += 1
+
+        for (course_id, teacher_id), classes in tqdm(classes_per_course.items(), desc="Создание расписания"):
+            for classroom, class_time, duration in allocator.schedule(
+                    course_id, days, slots, classes, teacher=teacher_id):
                 batch.append((
                     course_id,
                     teacher_id,
@@ -288,9 +313,10 @@ class DataGenerator:
                     class_time,
                     duration
                 ))
-            else:
-                # If not unique, try generating a new one
-                continue
+
+        if len(batch) < self.config.num_schedule:
+            logger.warning(f"Свободных аудиторий и времени хватило только на {len(batch)} занятий "
+                           f"из {self.config.num_schedule}")
 
         self.execute_batch(
             """INSERT INTO Schedule
@@ -300,20 +326,27 @@ class DataGenerator:
             desc="Вставка расписания"
         )
         self.ids_cache["schedule_ids"] = self._fetch_ids("SELECT schedule_id FROM Schedule")
+        self.index_cache.pop('schedule', None)
 
     def generate_enrollments(self) -> None:
         """
         Генерация и вставка записей на курсы в базу данных.
         """
         logger.info("Генерация записей на курсы...")
+        academic_start = self.config.academic_year["start"].date()
+        state = {
+            'courses': self._index('courses'),
+            'students_by_department': self._index('students_by_department'),
+        }
         batch = []
 
-        with ThreadPoolExecutor(max_workers=15) as executor:  # Limit the number of concurrent threads
-            futures = [executor.submit(self._process_course_enrollments, course_id)
-                      for course_id in self.ids_cache["course_ids"]]
-
-            for future in tqdm(futures, desc="Обработка курсов"):
-                batch.extend(future.result())
+        for student_ids, course_ids, day_offsets in self._run_tasks(
+                _course_enrollments_task, self.ids_cache["course_ids"], state, desc="Обработка курсов"):
+            batch.extend(
+                (student_id, course_id, academic_start + timedelta(days=offset))
+                for student_id, course_id, offset in zip(
+                    student_ids.tolist(), course_ids.tolist(), day_offsets.tolist())
+            )
 
         self.execute_batch(
             """INSERT INTO Enrollments
@@ -322,31 +355,7 @@ class DataGenerator:
             batch,
             desc="Вставка записей"
         )
-
-    def _process_course_enrollments(self, course_id: int) -> List[Tuple]:
-        """
-        Обработка записей на конкретный курс.
-
-        Args:
-            course_id: ID курса для обработки записей.
-
-        Returns:
-            Список кортежей, содержащих данные о записях.
-        """
-        dept_id = self._fetch_ids(f"SELECT department_id FROM Courses WHERE course_id = {course_id}")[0]
-        students = self._fetch_ids(f"SELECT student_id FROM Students WHERE department_id = {dept_id}")
-
-        return [
-            (
-                student_id,
-                course_id,
-                self.fake.date_between(
-                    start_date=self.config.academic_year["start"] - timedelta(days=30),
-                    end_date=self.config.academic_year["start"] + timedelta(days=30)
-                )
-            )
-            for student_id in random.sample(students, k=min(200, len(students)))
-        ]
+        self.index_cache.pop('enrollments_by_course', None)
 
     def generate_grades(self) -> None:
         """
@@ -354,32 +363,32 @@ class DataGenerator:
         """
         logger.info("Генерация оценок...")
         enrollments = self._fetch_rows("SELECT student_id, course_id FROM Enrollments")
+        exam_types = ['экзамен', 'зачет', 'курсовая']
         batch = []
-        used_grade_entries = set()
 
-        for _ in tqdm(range(self.config.num_grades), desc="Создание оценок"):
-            student_id, course_id = random.choice(enrollments)
-            exam_type = random.choice(['экзамен', 'зачет', 'курсовая'])
-
-            # Create a unique key for the grade entry
-            grade_entry_key = f"{student_id}-{course_id}-{exam_type}"
-
-            # Check if the grade entry is unique
-            if grade_entry_key not in used_grade_entries:
-                used_grade_entries.add(grade_entry_key)
-                batch.append((
-                    student_id,
-                    course_id,
-                    round(random.uniform(2.0, 5.0), 1),
-                    self.fake.date_between(
-                        start_date=self.config.academic_year["start"],
-                        end_date=self.config.academic_year["end"]
-                    ),
-                    exam_type
-                ))
-            else:
-                # If not unique, try generating a new one
-                continue
+        # Ключ сочетания (зачисление, тип экзамена) — одно целое число; выборка ключей без
+        # возвращения сразу соблюдает UNIQUE (student_id, course_id, exam_type)
+        keys = np.empty(0, dtype=np.int64)
+        if enrollments:
+            space = CombinationSpace(len(enrollments), len(exam_types))
+            keys = space.sample(np.random.default_rng(self._task_seed('generate_grades', 0)), self.config.num_grades)
+        if len(keys) < self.config.num_grades:
+            logger.warning(f"Различных сочетаний (студент, курс, тип экзамена) хватает только на "
+                           f"{len(keys)} оценок из {self.config.num_grades}")
+
+        for key in tqdm(keys.tolist(), desc="Создание оценок"):
+            enrollment_pos, exam_pos = space.decode(key)
+            student_id, course_id = enrollments[enrollment_pos]
+            batch.append((
+                student_id,
+                course_id,
+                round(random.uniform(2.0, 5.0), 1),
+                self.fake.date_between(
+                    start_date=self.config.academic_year["start"],
+                    end_date=self.config.academic_year["end"]
+                ),
+                exam_types[exam_pos]
+            ))
 
         self.execute_batch(
             """INSERT INTO Grades
@@ -394,14 +403,27 @@ class DataGenerator:
         Генерация и вставка посещаемости в базу данных.
         """
         logger.info("Генерация посещаемости...")
+        schedule = self._index('schedule')
+        state = {
+            'schedule': schedule,
+            'enrollments_by_course': self._index('enrollments_by_course'),
+        }
         batch = []
 
-        with ThreadPoolExecutor(max_workers=15) as executor:  # Limit the number of concurrent threads
-            futures = [executor.submit(self._process_schedule_attendance, schedule_id)
-                      for schedule_id in self.ids_cache["schedule_ids"]]
-
-            for future in tqdm(futures, desc="Обработка занятий"):
-                batch.extend(future.result())
+        for student_ids, schedule_ids, statuses, check_seconds, notes in self._run_tasks(
+                _schedule_attendance_task, self.ids_cache["schedule_ids"], state, desc="Обработка занятий"):
+            notes = iter(notes)
+            for student_id, schedule_id, status, seconds in zip(
+                    student_ids.tolist(), schedule_ids.tolist(), statuses.tolist(), check_seconds.tolist()):
+                status = ATTENDANCE_STATUSES[status]
+                batch.append((
+                    student_id,
+                    schedule_id,
+                    status,
+                    schedule[schedule_id][1].date(),
+                    f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}" if seconds >= 0 else None,
+                    next(notes) if status == 'excused' else None
+                ))
 
         self.execute_batch(
             """INSERT INTO Attendance
@@ -411,36 +433,6 @@ class DataGenerator:
             desc="Вставка посещаемости"
         )
 
-    def _process_schedule_attendance(self, schedule_id: int) -> List[Tuple]:
-        """
-        Обработка посещаемости для конкретного расписания.
-
-        Args:
-            schedule_id: ID расписания для обработки посещаемости.
-
-        Returns:
-            Список кортежей, содержащих данные о посещаемости.
-        """
-        course_id = self._fetch_ids(f"SELECT course_id FROM Schedule WHERE schedule_id = {schedule_id}")[0]
-        students = self._fetch_ids(f"SELECT student_id FROM Enrollments WHERE course_id = {course_id}")
-        statuses = ['present', 'absent', 'excused', 'late']
-        weights = [0.75, 0.15, 0.05, 0.05]
-
-        attendance = []
-        for student_id in random.sample(students, k=min(30, len(students))):
-            status = random.choices(statuses, weights=weights)[0]
-            check_time = self.fake.time_object() if status in ['present', 'late'] else None
-
-            attendance.append((
-                student_id,
-                schedule_id,
-                status,
-                self._fetch_ids(f"SELECT class_time FROM Schedule WHERE schedule_id = {schedule_id}")[0].date(),
-                check_time.strftime('%H:%M:%S') if check_time else None,
-                self.fake.sentence() if status == 'excused' else None
-            ))
-        return attendance
-
     def generate_assignments(self) -> None:
         """
         Генерация и вставка заданий в базу данных.
@@ -448,8 +440,9 @@ class DataGenerator:
         logger.info("Генерация заданий...")
         batch = []
 
+        courses = self._index('courses')
         for course_id in self.ids_cache["course_ids"]:
-            start_date = self._fetch_ids(f"SELECT start_date FROM Courses WHERE course_id = {course_id}")[0]
+            _, start_date = courses[course_id]
 
             for _ in range(random.randint(3, 8)):
                 due_date = self.fake.date_between(
@@ -480,19 +473,14 @@ class DataGenerator:
         """
         logger.info("Генерация оценок за задания...")
         batch = []
+        assignments = self._fetch_rows("""
+            SELECT a.assignment_id, c.course_id, a.due_date
+            FROM Assignments a
+            JOIN Courses c ON a.course_id = c.course_id
+        """)
 
-        with ThreadPoolExecutor(max_workers=15) as executor:  # Limit the number of concurrent threads
-            assignments = self._fetch_rows("""
-                SELECT a.assignment_id, c.course_id, a.due_date
-                FROM Assignments a
-                JOIN Courses c ON a.course_id = c.course_id
-            """)
-
-            futures = [executor.submit(self._process_assignment_grades, *assignment)
-                      for assignment in assignments]
-
-            for future in tqdm(futures, desc="Обработка заданий"):
-                batch.extend(future.result())
+        for assignment in tqdm(assignments, desc="Обработка заданий"):
+            batch.extend(self._process_assignment_grades(*assignment))
 
         self.execute_batch(
             """INSERT INTO AssignmentGrades
@@ -514,7 +502,8 @@ class DataGenerator:
         Returns:
             Список кортежей, содержащих данные об оценках за задания.
         """
-        students = self._fetch_ids(f"SELECT student_id FROM Enrollments WHERE course_id = {course_id}")
+        students = self._index('enrollments_by_course').get(course_id, [])
+        _, start_date = self._index('courses')[course_id]
 
         return [
             (
@@ -522,7 +511,7 @@ class DataGenerator:
                 student_id,
                 round(random.uniform(0.0, 100.0), 2),
                 self.fake.date_time_between(
-                    start_date=self._fetch_ids(f"SELECT start_date FROM Courses WHERE course_id = {course_id}")[0],
+                    start_date=start_date,
                     end_date=due_date
                 ).strftime('%Y-%m-%d %H:%M:%S'),
                 self.fake.paragraph(nb_sentences=1)
@@ -530,38 +519,94 @@ class DataGenerator:
             for student_id in random.sample(students, k=min(50, len(students)))
         ]
 
-    def _generate_unique_value(self, cache_key: str, pattern: str) -> str:
+    def _generate_email(self, first: str, last: str, domain: str) -> str:
         """
-        Генерация уникального значения на основе шаблона.
+        Генерация уникального email: к инициалу и фамилии добавляется следующий код
+        псевдослучайной перестановки, поэтому адреса не повторяются без учета уже выданных.
 
         Args:
-            cache_key: Ключ для использования в кэше.
-            pattern: Шаблон для генерации значения.
+            first: Имя.
+            last: Фамилия.
+            domain: Домен почты.
 
         Returns:
-            Уникальное значение на основе шаблона.
+            Уникальный адрес электронной почты.
         """
-        counter = 1
-        value = pattern
-        while value in self.cache[cache_key]:
-            value = f"{pattern}_{counter}"
-            counter += 1
-        self.cache[cache_key].add(value)
-        return value
+        return f"{first[0].lower()}.{last.lower()}{self.email_codes.next()}@{domain}"
 
     def _generate_phone(self) -> str:
         """
-        Генерация случайного номера телефона.
+        Генерация уникального номера телефона: следующий номер псевдослучайной
+        перестановки всех номеров, без повторных попыток.
+
+        Returns:
+            Уникальный номер телефона.
+        """
+        number = self.phone_numbers.next()
+        return f"+7{PHONE_CODES[number // 10**7]}{number % 10**7:07d}"
+
+    def _task_seed(self, task_name: str, task_index: int) -> int:
+        """
+        Seed задачи, зависящий только от --seed, имени задачи и ее номера.
+
+        Args:
+            task_name: Имя функции задачи.
+            task_index: Номер задачи.
 
         Returns:
-            Случайно сгенерированный номер телефона.
+            Seed для генераторов случайных чисел задачи.
+        """
+        sequence = np.random.SeedSequence([self.config.seed, zlib.crc32(task_name.encode()), task_index])
+        return int(sequence.generate_state(1)[0])
+
+    def _run_tasks(self, task, items: List[Any], state: Dict[str, Any], desc: str = None):
         """
-        codes = ['901', '902', '904', '908', '915', '916', '919', '920', '921', '922']
-        while True:
-            phone = f"+7{random.choice(codes)}{random.randint(1000000, 9999999):07d}"
-            if phone not in self.used_phones:
-                self.used_phones.add(phone)
-                return phone
+        Выполнение задачи над элементами items пачками по TASK_SIZE в пуле процессов
+        (или в текущем процессе при --workers <= 1). Результаты возвращаются в порядке пачек.
+
+        Args:
+            task: Функция уровня модуля, принимающая (seed, пачка элементов).
+            items: Элементы для обработки (ID курсов, занятий и т.п.).
+            state: Индексы, передаваемые в процессы один раз при их запуске.
+            desc: Описание для прогресс-бара.
+
+        Returns:
+            Итератор результатов задач.
+        """
+        tasks = [
+            (self._task_seed(task.__name__, task_index), items[start:start + TASK_SIZE])
+            for task_index, start in enumerate(range(0, len(items), TASK_SIZE))
+        ]
+        if self.config.workers > 1:
+            with ProcessPoolExecutor(max_workers=self.config.workers,
+                                     initializer=_init_worker, initargs=(state,)) as executor:
+                yield from tqdm(executor.map(task, tasks), total=len(tasks), desc=desc)
+        else:
+            _init_worker(state)
+            yield from map(task, tqdm(tasks, desc=desc))
+
+    def _index(self, name: str) -> Dict[Any, Any]:
+        """
+        Получение in-memory индекса из INDEX_QUERIES. Индекс загружается одним запросом
+        при первом обращении и сбрасывается после вставки в соответствующую таблицу.
+
+        Args:
+            name: Имя индекса.
+
+        Returns:
+            Словарь: ключ -> кортеж остальных столбцов или список сгруппированных значений.
+        """
+        if name not in self.index_cache:
+            query, grouped = INDEX_QUERIES[name]
+            rows = self._fetch_rows(query)
+            if grouped:
+                index = defaultdict(list)
+                for key, value in rows:
+                    index[key].append(value)
+                self.index_cache[name] = dict(index)
+            else:
+                self.index_cache[name] = {row[0]: tuple(row[1:]) for row in rows}
+        return self.index_cache[name]
 
     def _fetch_ids(self, query: str) -> List[Any]:
         """
@@ -605,6 +650,10 @@ class DataGenerator:
         # Ensure the directory exists
         os.makedirs('data', exist_ok=True)
 
+        if self.config.output_format == 'parquet':
+            self._write_to_parquet(os.path.splitext(filename)[0] + '.parquet', query)
+            return
+
         with self.connection_pool.get_connection() as conn:
             with conn.cursor() as cursor:
                 cursor.execute(query)
@@ -617,6 +666,115 @@ class DataGenerator:
 
         logger.info(f"Данные записаны в файл data/{filename}")
 
+    def _write_to_parquet(self, filename: str, query: str) -> None:
+        """
+        Потоковая запись результата запроса в Parquet. Названия столбцов берутся из курсора,
+        типы — из information_schema (DATE, DECIMAL, ENUM и т.д. сохраняются как типы Parquet).
+
+        Args:
+            filename: Имя файла для записи.
+            query: SQL-запрос вида SELECT ... FROM <таблица>.
+        """
+        from parquet_io import ParquetTableWriter, arrow_schema, load_mysql_schema
+
+        table = re.search(r'FROM\s+(\w+)', query, flags=re.I).group(1)
+        with self.connection_pool.get_connection() as conn:
+            with conn.cursor() as cursor:
+                column_types = load_mysql_schema(cursor, self.config.db_name).get(table, {})
+            with conn.cursor(buffered=False) as cursor:
+                cursor.execute(query)
+                headers = [col[0] for col in cursor.description]
+                schema = arrow_schema(headers, column_types)
+                with ParquetTableWriter(f'data/{filename}', schema, self.config.compression,
+                                        self.config.row_group_size) as writer:
+                    while rows := cursor.fetchmany(self.config.batch_size * 10):
+                        writer.write_rows(rows)
+
+        logger.info(f"Данные записаны в файл data/{filename}")
+
+
+# Состояние процесса пула: индексы, переданные через initializer
+_worker_state = {}
+
+
+def _init_worker(state: Dict[str, Any]) -> None:
+    """
+    Инициализация процесса пула: сохраняет индексы и создает собственный Faker.
+
+    Args:
+        state: Индексы, необходимые задачам.
+    """
+    _worker_state.clear()
+    _worker_state.update(state)
+    _worker_state['fake'] = Faker('ru_RU')
+
+
+def _course_enrollments_task(task: Tuple[int, List[int]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Записи на курсы для пачки курсов: до 200 студентов факультета курса.
+
+    Args:
+        task: Seed задачи и список ID курсов.
+
+    Returns:
+        Массивы ID студентов, ID курсов и смещений даты записи (в днях от начала учебного года).
+    """
+    seed, course_ids = task
+    rng = np.random.default_rng(seed)
+    courses = _worker_state['courses']
+    students_by_department = _worker_state['students_by_department']
+
+    student_parts, course_parts = [], []
+    for course_id in course_ids:
+        dept_id, _ = courses[course_id]
+        students = students_by_department.get(dept_id, [])
+        sampled = rng.choice(np.asarray(students, dtype=np.int64), size=min(200, len(students)), replace=False)
+        student_parts.append(sampled)
+        course_parts.append(np.full(len(sampled), course_id, dtype=np.int64))
+
+    student_ids = np.concatenate(student_parts) if student_parts else np.empty(0, dtype=np.int64)
+    course_ids = np.concatenate(course_parts) if course_parts else np.empty(0, dtype=np.int64)
+    day_offsets = rng.integers(-30, 31, len(student_ids)).astype(np.int16)
+    return student_ids, course_ids, day_offsets
+
+
+def _schedule_attendance_task(task: Tuple[int, List[int]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray,
+                                                                    np.ndarray, List[str]]:
+    """
+    Посещаемость для пачки занятий: до 30 записанных на курс студентов на занятие.
+
+    Args:
+        task: Seed задачи и список ID занятий.
+
+    Returns:
+        Массивы ID студентов, ID занятий, кодов статуса (индекс в ATTENDANCE_STATUSES),
+        времени отметки в секундах от полуночи (-1, если отметки нет) и список примечаний
+        для статуса excused в порядке строк.
+    """
+    seed, schedule_ids = task
+    rng = np.random.default_rng(seed)
+    fake = _worker_state['fake']
+    fake.seed_instance(seed)
+    schedule = _worker_state['schedule']
+    enrollments_by_course = _worker_state['enrollments_by_course']
+
+    student_parts, schedule_parts = [], []
+    for schedule_id in schedule_ids:
+        course_id, _ = schedule[schedule_id]
+        students = enrollments_by_course.get(course_id, [])
+        sampled = rng.choice(np.asarray(students, dtype=np.int64), size=min(30, len(students)), replace=False)
+        student_parts.append(sampled)
+        schedule_parts.append(np.full(len(sampled), schedule_id, dtype=np.int64))
+
+    student_ids = np.concatenate(student_parts) if student_parts else np.empty(0, dtype=np.int64)
+    schedule_ids = np.concatenate(schedule_parts) if schedule_parts else np.empty(0, dtype=np.int64)
+    statuses = ATTENDANCE_STATUS.sample_codes(rng, len(student_ids)).astype(np.int8)
+    checked = np.isin(statuses, [ATTENDANCE_STATUSES.index('present'), ATTENDANCE_STATUSES.index('late')])
+    check_seconds = np.where(checked, rng.integers(0, 86400, len(student_ids)), -1).astype(np.int32)
+    notes = [fake.sentence() for _ in range(int(np.count_nonzero(statuses == ATTENDANCE_STATUSES.index('excused'))))]
+    return student_ids, schedule_ids, statuses, check_seconds, notes
+
+
 def parse_args() -> argparse.Namespace:
     """
     Парсинг аргументов командной строки.
@@ -636,6 +794,13 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument('--grades', type=int, default=5000, help='Количество оценок для генерации')
     parser.add_argument('--batch', type=int, default=1000, help='Размер пакета для вставки в базу данных')
     parser.add_argument('--seed', type=int, default=42, help='Seed для генерации случайных данных')
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv',
+                        help='Формат файлов, выгружаемых в каталог data')
+    parser.add_argument('--compression', default='zstd',
+                        help='Сжатие Parquet: zstd, snappy, gzip, brotli, lz4, none')
+    parser.add_argument('--row-group-size', type=int, default=100000, help='Строк в группе строк Parquet')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Число процессов для генерации записей на курсы и посещаемости (1 — без пула)')
     return parser.parse_args()
 
 def main() -> None:
@@ -657,6 +822,10 @@ def main() -> None:
         num_grades=args.grades,  # Ensure this line is included
         batch_size=args.batch,
         seed=args.seed,
+        workers=args.workers,
+        output_format=args.format,
+        compression=args.compression,
+        row_group_size=args.row_group_size,
         academic_year={
             "start": datetime(datetime.now().year - 1, 9, 1),
             "end": datetime(datetime.now().year, 6, 30)
@@ -1,13 +1,26 @@
 import os
 import csv
+import argparse
+import json
 import logging
+import pickle
 import random
-from datetime import datetime, timedelta
+import shutil
+import zlib
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from itertools import chain, islice
+from datetime import datetime, time, timedelta
 from pathlib import Path
 from faker import Faker
 from tqdm import tqdm
 import numpy as np
 
+from samplers import ATTENDANCE_STATUS, STUDENT_STATUS
+from schedule_slots import SlotAllocator, classroom_names, days_between
+from unique_keys import CombinationSpace, UniqueCodes, UniqueNumbers
+
 # Настройка логирования
 logging.basicConfig(
     level=logging.INFO,
@@ -19,16 +32,177 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Движки генерации таблиц фактов: построчный (Python) и векторный (NumPy)
+ENGINES = ('python', 'numpy')
+
+# Форматы выходных файлов; parquet требует pyarrow (см. parquet_io.py)
+FORMATS = ('csv', 'parquet')
+
+# Размер пула предложений для векторного движка
+SENTENCE_POOL_SIZE = 1000
+
+# Время суток с точностью до минуты в формате TIME ('HH:MM:SS')
+TIMES_OF_DAY = np.array([f"{m // 60:02d}:{m % 60:02d}:00" for m in range(24 * 60)], dtype=object)
+
+# Типы экзаменов (Grades: UNIQUE (student_id, course_id, exam_type))
+EXAM_TYPES = ['экзамен', 'зачет', 'курсовая']
+
+
+class ColumnarTable:
+    """Таблица, хранящаяся по столбцам (массивы NumPy); строки собираются только при записи"""
+
+    def __init__(self, headers: list[str], columns: list[np.ndarray]):
+        self.headers = headers
+        self.columns = columns
+
+    def __len__(self):
+        return len(self.columns[0]) if self.columns else 0
+
+    def iter_chunks(self, chunk_size: int = 100000):
+        """Собирает строки пачками по chunk_size"""
+        for start in range(0, len(self), chunk_size):
+            yield list(zip(*(column[start:start + chunk_size].tolist() for column in self.columns)))
+
+    def __iter__(self):
+        for chunk in self.iter_chunks():
+            yield from chunk
+
+    @classmethod
+    def concat(cls, headers: list[str], chunks: Iterable['ColumnarTable']) -> 'ColumnarTable':
+        """Склеивает пачки столбцов в одну таблицу"""
+        chunks = list(chunks)
+        if not chunks:
+            return cls(headers, [np.empty(0) for _ in headers])
+        return cls(headers, [np.concatenate([chunk.columns[i] for chunk in chunks]) for i in range(len(headers))])
+
+
+class KeyColumns(Sequence):
+    """
+    Ключевые столбцы таблицы (id и внешние ключи), оставленные в памяти после потоковой записи.
+    Столбцы хранятся в массивах NumPy, а строка отдается как словарь {номер столбца: значение},
+    поэтому код вида student[9] работает и с полными строками, и с ключевыми столбцами
+    """
+
+    def __init__(self, columns: dict[int, np.ndarray], length: int):
+        self.columns = columns
+        self.length = length
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index: int) -> dict:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.length))]
+        return {pos: column[index].item() if isinstance(column[index], np.generic) else column[index]
+                for pos, column in self.columns.items()}
+
+    def __iter__(self) -> Iterator[dict]:
+        lists = {pos: column.tolist() for pos, column in self.columns.items()}
+        for i in range(self.length):
+            yield {pos: values[i] for pos, values in lists.items()}
+
+
+# Виды значений Faker, для которых строятся пулы
+FAKER_VALUES = {
+    'first_name': lambda fake: fake.first_name(),
+    'last_name': lambda fake: fake.last_name(),
+    'country': lambda fake: fake.country(),
+    'catch_phrase': lambda fake: fake.catch_phrase(),
+    'sentence': lambda fake: fake.sentence(),
+    'text_60': lambda fake: fake.text(60),
+    'text_80': lambda fake: fake.text(80),
+}
+
+
+class ValuePools:
+    """
+    Пулы заранее сгенерированных значений Faker (имена, страны, предложения, биографии).
+    Пулы строятся один раз для локали и сохраняются на диск; при следующих запусках
+    значения выбираются из пула по случайному индексу без обращения к Faker
+    """
+
+    def __init__(self, pools: dict[str, list[str]]):
+        self.pools = pools
+        self.arrays = {kind: np.array(values, dtype=object) for kind, values in pools.items()}
+
+    @classmethod
+    def load_or_build(cls, fake: Faker, pool_dir: Path, size: int) -> 'ValuePools':
+        """Загружает пулы локали из pool_dir или строит их и сохраняет"""
+        locale = fake.locales[0]
+        file_path = Path(pool_dir) / f"faker_pools_{locale}_{size}.json"
+        if file_path.exists():
+            with open(file_path, encoding='utf-8') as f:
+                pools = json.load(f)
+            logger.info(f"Пулы значений Faker загружены из {file_path}")
+            return cls(pools)
+        
+        logger.info(f"Построение пулов значений Faker ({locale}, по {size} значений)...")
+        pools = {
+            kind: [make(fake) for _ in range(size)]
+            for kind, make in tqdm(FAKER_VALUES.items(), desc="Пулы Faker")
+        }
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(pools, f, ensure_ascii=False)
+        logger.info(f"Пулы значений Faker сохранены в {file_path}")
+        return cls(pools)
+
+    def sample(self, kind: str) -> str:
+        """Одно случайное значение (через модуль random, как и остальная построчная генерация)"""
+        values = self.pools[kind]
+        return values[random.randrange(len(values))]
+
+    def sample_many(self, kind: str, count: int, rng: np.random.Generator) -> np.ndarray:
+        """count случайных значений одним вызовом"""
+        values = self.arrays[kind]
+        return values[rng.integers(0, len(values), count)]
+
+
+# Пространство номеров телефонов: +1-AAA-XXX-XXXX, код региона 200-999
+PHONE_SPACE = 800 * 10**7
+
+# Ключевые столбцы, которые нужны следующим генераторам: {номер столбца: dtype}
+STUDENT_KEYS = {0: np.int64, 8: 'datetime64[D]', 9: np.int64, 10: np.int64, 12: object}
+ENROLLMENT_KEYS = {0: np.int64, 1: np.int64, 2: np.int64}
+
+
 class EducationalDataGenerator:
-    def __init__(self, output_dir: str = 'edu_data'):
+    def __init__(self, output_dir: str = 'edu_data', engine: str = 'python',
+                 stream: bool = False, chunk_size: int = 100000,
+                 seed: int = 42, workers: int = 0, shard_size: int = 10000,
+                 pool_dir: str | None = None, pool_size: int = 10000,
+                 output_format: str = 'csv', compression: str = 'zstd', row_group_size: int = 100000):
+        if engine not in ENGINES:
+            raise ValueError(f"Неизвестный движок генерации: {engine}")
+        if output_format not in FORMATS:
+            raise ValueError(f"Неизвестный формат файлов: {output_format}")
         self.fake = Faker()
-        random.seed(42)
+        self.seed = seed
+        random.seed(seed)
+        self.fake.seed_instance(seed)
+        self.rng = np.random.default_rng(seed)
+        self.engine = engine
+        # Потоковый режим: таблицы пишутся пачками, в памяти остаются только ключевые столбцы
+        self.stream = stream
+        self.chunk_size = chunk_size
+        # Шардирование: студенты, посещаемость и оценки за задания делятся на шарды по shard_size
+        # элементов с собственными seed и генерируются в пуле из workers процессов (0 — без шард)
+        self.workers = workers
+        self.shard_size = shard_size
+        # Пулы значений Faker (None — каждое значение генерируется Faker заново)
+        self.pools = ValuePools.load_or_build(self.fake, pool_dir, pool_size) if pool_dir else None
+        self._sentence_pool = None
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        # Формат файлов: для parquet типы столбцов берутся из create_educational_institution.sql
+        self.output_format = output_format
+        self.compression = compression
+        self.row_group_size = row_group_size
+        self._column_types = None
         
-        # Кэш для уникальных значений
-        self.used_emails = set()
-        self.used_phones = set()
+        # Уникальные коды email и номера телефонов (биективная перестановка порядкового номера)
+        self.email_codes = UniqueCodes(seed)
+        self.phone_numbers = UniqueNumbers(PHONE_SPACE, seed)
         
         # Структуры для хранения данных
         self.universities = []
@@ -46,12 +220,23 @@ class EducationalDataGenerator:
         
         # Мэппинги для быстрого доступа
         self.university_departments = {}
+        self.department_teachers = {}
         self.department_students = {}
         self.course_schedules = {}
         self.student_enrollments = {}
         self.course_assignments = {}
         self.group_to_department = {}  # Новый словарь для связи групп и факультетов
 
+        # Индексы первичных ключей (id -> строка)
+        self.university_index = {}
+        self.department_index = {}
+        self.course_index = {}
+        self.schedule_index = {}
+
+        # Индексы внешних ключей (родитель -> дочерние строки)
+        self.department_courses = {}
+        self.course_students = {}
+
         # Инициализация реалистичных данных
         self._init_realistic_data()
 
@@ -193,32 +378,197 @@ class EducationalDataGenerator:
                 'founded_year': year
             })
 
-    def _generate_unique_email(self, prefix: str) -> str:
-        """Генерирует уникальный email"""
-        while True:
-            email = f"{prefix}{random.randint(1000, 9999)}@{self.fake.free_email_domain()}"
-            if email not in self.used_emails:
-                self.used_emails.add(email)
-                return email
-
-    def _generate_unique_phone(self) -> str:
-        """Генерирует уникальный номер телефона"""
-        while True:
-            phone = self.fake.unique.phone_number()
-            if phone not in self.used_phones:
-                self.used_phones.add(phone)
-                return phone
-
-    def _save_to_csv(self, table_name: str, headers: list[str], data: list[tuple]):
-        """Сохраняет данные в CSV файл"""
-        file_path = self.output_dir / f"{table_name}.csv"
-        with open(file_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(headers)
-            writer.writerows(data)
-        logger.info(f"Сгенерирован файл {file_path} с {len(data)} записями")
+    def _generate_unique_email(self, prefix: str, index: int) -> str:
+        """Генерирует уникальный email: код зависит только от порядкового номера index"""
+        return f"{prefix}{self.email_codes.value(index)}@{self.fake.free_email_domain()}"
+
+    def _generate_unique_phone(self, index: int) -> str:
+        """Генерирует уникальный номер телефона по порядковому номеру index"""
+        number = self.phone_numbers.value(index)
+        return f"+1-{200 + number // 10**7}-{number // 10**4 % 1000:03d}-{number % 10**4:04d}"
+
+    @staticmethod
+    def _build_index(rows: list, key_pos: int = 0) -> dict:
+        """Строит индекс первичного ключа: значение столбца -> строка"""
+        return {row[key_pos]: row for row in rows}
+
+    @staticmethod
+    def _group_by(rows: list, key_pos: int) -> dict:
+        """Строит индекс внешнего ключа: значение столбца -> список строк"""
+        groups = {}
+        for row in rows:
+            groups.setdefault(row[key_pos], []).append(row)
+        return groups
+
+    @contextmanager
+    def _table_writer(self, table_name: str, headers: list[str]):
+        """
+        Открывает файл таблицы в формате self.output_format и отдает функцию записи
+        пачки (списка строк или ColumnarTable)
+        """
+        file_path = self.output_dir / f"{table_name}.{self.output_format}"
+        if self.output_format == 'parquet':
+            from parquet_io import ParquetTableWriter, arrow_schema, load_sql_schema
+            if self._column_types is None:
+                self._column_types = load_sql_schema()
+            schema = arrow_schema(headers, self._column_types.get(table_name, {}))
+            with ParquetTableWriter(file_path, schema, self.compression, self.row_group_size) as writer:
+                yield lambda chunk: (writer.write_columns(chunk.columns) if isinstance(chunk, ColumnarTable)
+                                     else writer.write_rows(chunk))
+        else:
+            with open(file_path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(headers)
+                yield writer.writerows
+
+    def _save_table(self, table_name: str, headers: list[str], data: list[tuple] | ColumnarTable):
+        """Сохраняет данные в файл (CSV или Parquet)"""
+        with self._table_writer(table_name, headers) as write:
+            write(data)
+        logger.info(f"Сгенерирован файл {table_name}.{self.output_format} с {len(data)} записями")
         return data
 
+    def _fake_value(self, kind: str) -> str:
+        """Значение Faker вида kind: из пула, если пулы включены, иначе прямым вызовом Faker"""
+        if self.pools is not None:
+            return self.pools.sample(kind)
+        return FAKER_VALUES[kind](self.fake)
+
+    def _reseed(self, seed: int):
+        """Переинициализирует генераторы случайных чисел random, Faker и NumPy (для шард)"""
+        random.seed(seed)
+        self.fake.seed_instance(seed)
+        self.rng = np.random.default_rng(seed)
+
+    def _shard_seed(self, method: str, shard_index: int) -> int:
+        """Seed шарды, зависящий только от общего seed, таблицы и номера шарды"""
+        sequence = np.random.SeedSequence([self.seed, zlib.crc32(method.encode()), shard_index])
+        return int(sequence.generate_state(1)[0])
+
+    def _shared_state(self) -> dict:
+        """Атрибуты, общие для всех шард: пулы значений и генераторы уникальных ключей"""
+        return {'pools': self.pools, 'email_codes': self.email_codes, 'phone_numbers': self.phone_numbers}
+
+    def _run_shards(self, method: str, items: list, state: dict) -> Iterator[list]:
+        """
+        Делит items на шарды по self.shard_size и генерирует их методом method в пуле процессов.
+        Пачки строк отдаются строго по порядку шард, поэтому результат не зависит от числа процессов.
+        state — атрибуты генератора, которые нужны методу в рабочем процессе
+        """
+        shard_dir = self.output_dir / '.shards'
+        shard_dir.mkdir(exist_ok=True)
+        tasks = [
+            (method, self._shard_seed(method, index), items[start:start + self.shard_size],
+             shard_dir / f"{method}_{index:05d}.pkl")
+            for index, start in enumerate(range(0, len(items), self.shard_size))
+        ]
+        logger.info(f"{method}: {len(tasks)} шард, процессов: {self.workers}")
+        
+        pool = None
+        if self.workers > 1:
+            pool = ProcessPoolExecutor(self.workers, initializer=_init_shard_worker,
+                                       initargs=(str(self.output_dir), {**state, **self._shared_state()}))
+            results = pool.map(_run_shard, tasks)
+        else:
+            # Шарды в текущем процессе: модуль random общий, поэтому сохраняем его состояние
+            random_state = random.getstate()
+            _init_shard_worker(str(self.output_dir), {**state, **self._shared_state()})
+            results = [_run_shard(task) for task in tasks]
+            random.setstate(random_state)
+        try:
+            for part_path in tqdm(results, total=len(tasks), desc="Шарды"):
+                with open(part_path, 'rb') as f:
+                    while True:
+                        try:
+                            yield pickle.load(f)
+                        except EOFError:
+                            break
+                part_path.unlink()
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+            shutil.rmtree(shard_dir, ignore_errors=True)
+
+    def _plan_quotas(self, base: np.ndarray, total: int, capacity: np.ndarray | None = None) -> np.ndarray:
+        """
+        Точные квоты строк на родителя (курс, студента...), в сумме равные total.
+        Избыток над total снимается с base случайно и равномерно по строкам,
+        недостаток распределяется равномерно по родителям, у которых еще есть емкость
+        (capacity — максимум строк на родителя, None — без ограничения).
+        Если общей емкости не хватает, квоты заполняют ее целиком (с предупреждением)
+        """
+        base = np.asarray(base, dtype=np.int64)
+        if capacity is not None:
+            base = np.minimum(base, capacity)
+        surplus = int(base.sum()) - total
+        if surplus >= 0:
+            return base - self.rng.multivariate_hypergeometric(base, surplus) if surplus else base
+        
+        quotas = base.copy()
+        spare = np.full(len(quotas), total) if capacity is None else capacity - quotas
+        missing = -surplus
+        if missing > spare.sum():
+            logger.warning(f"Емкости хватает только на {int(quotas.sum() + spare.sum())} строк из {total}")
+            missing = int(spare.sum())
+        # Каждый раунд либо размещает все оставшиеся строки, либо заполняет хотя бы одного родителя
+        while missing:
+            open_parents = np.flatnonzero(spare > 0)
+            added = np.minimum(self.rng.multinomial(missing, np.full(len(open_parents), 1 / len(open_parents))),
+                               spare[open_parents])
+            quotas[open_parents] += added
+            spare[open_parents] -= added
+            missing -= int(added.sum())
+        return quotas
+
+    def _chunked(self, rows: Iterable) -> Iterator[list]:
+        """Разбивает поток строк на пачки по self.chunk_size"""
+        rows = iter(rows)
+        while chunk := list(islice(rows, self.chunk_size)):
+            yield chunk
+
+    @staticmethod
+    def _chunk_column(chunk: list | ColumnarTable, pos: int, dtype) -> np.ndarray:
+        """Извлекает столбец из пачки строк или пачки столбцов"""
+        if isinstance(chunk, ColumnarTable):
+            return chunk.columns[pos].astype(dtype)
+        return np.array([row[pos] for row in chunk], dtype=dtype)
+
+    @staticmethod
+    def _column(table: list | KeyColumns, pos: int, dtype=np.int64) -> np.ndarray:
+        """Столбец таблицы в виде массива NumPy"""
+        if isinstance(table, KeyColumns):
+            return table.columns[pos]
+        return np.array([row[pos] for row in table], dtype=dtype)
+
+    def _write_table(self, table_name: str, headers: list[str], chunks: Iterable, keep: dict | None = None):
+        """
+        Записывает таблицу, поступающую пачками строк (или пачками столбцов ColumnarTable).
+        В потоковом режиме каждая пачка сразу пишется в файл, а в памяти остаются только
+        столбцы keep ({номер столбца: dtype}); иначе таблица собирается целиком
+        """
+        if not self.stream:
+            chunks = list(chunks)
+            if chunks and isinstance(chunks[0], ColumnarTable):
+                data = ColumnarTable.concat(headers, chunks)
+            else:
+                data = [row for chunk in chunks for row in chunk]
+            return self._save_table(table_name, headers, data)
+        
+        keep = keep or {}
+        parts = {pos: [] for pos in keep}
+        total = 0
+        with self._table_writer(table_name, headers) as write:
+            for chunk in chunks:
+                write(chunk)
+                for pos, dtype in keep.items():
+                    parts[pos].append(self._chunk_column(chunk, pos, dtype))
+                total += len(chunk)
+        logger.info(f"Сгенерирован файл {table_name}.{self.output_format} с {total} записями (потоковая запись)")
+        return KeyColumns(
+            {pos: np.concatenate(arrays) if arrays else np.empty(0, dtype=keep[pos]) for pos, arrays in parts.items()},
+            total
+        )
+
     def generate_universities(self):
         """Генерирует данные университетов"""
         logger.info("Генерация университетов...")
@@ -234,7 +584,8 @@ class EducationalDataGenerator:
             ])
 
         headers = ['university_id', 'university_name', 'city', 'country', 'founded_year']
-        self.universities = self._save_to_csv('Universities', headers, universities)
+        self.universities = self._save_table('Universities', headers, universities)
+        self.university_index = self._build_index(self.universities)
         return universities
 
     def generate_study_groups(self, count: int = 400):
@@ -253,7 +604,7 @@ class EducationalDataGenerator:
             ])
 
         headers = ['study_group_id', 'group_name']
-        self.study_groups = self._save_to_csv('Study_Groups', headers, study_groups)
+        self.study_groups = self._save_table('Study_Groups', headers, study_groups)
         return study_groups
 
     def generate_departments(self):
@@ -290,28 +641,33 @@ class EducationalDataGenerator:
                 dept_id += 1
 
         headers = ['department_id', 'department_name', 'university_id', 'head_of_department', 'created_at', 'updated_at']
-        self.departments = self._save_to_csv('Departments', headers, departments)
+        self.departments = self._save_table('Departments', headers, departments)
+        self._index_departments()
         return departments
 
+    def _index_departments(self):
+        """Обновляет индексы факультетов и связь университет -> факультеты"""
+        self.department_index = self._build_index(self.departments)
+        self.university_departments = self._group_by(self.departments, 2)
+
     def generate_teachers(self, count: int = 2400):
         """Генерирует данные преподавателей"""
         logger.info(f"Генерация {count} преподавателей...")
         qualifications = ['Профессор', 'Доцент', 'Старший преподаватель', 'Преподаватель']
         teachers = []
         
-        # Распределение по факультетам (10 на факультет)
-        departments_count = {dept[0]: 0 for dept in self.departments}
+        # Равномерное распределение по факультетам: очередной преподаватель уходит на факультет
+        # с наименьшим числом преподавателей (при равенстве — первый по порядку). Все счетчики
+        # стартуют с нуля, поэтому это обход факультетов по кругу — O(1) на преподавателя
+        department_ids = [dept[0] for dept in self.departments]
         
         for i in tqdm(range(1, count + 1)):
-            # Выбираем факультет с наименьшим количеством преподавателей
-            department_id = min(departments_count, key=departments_count.get)
-            departments_count[department_id] += 1
+            department_id = department_ids[(i - 1) % len(department_ids)]
             
-            department = next(dept for dept in self.departments if dept[0] == department_id)
-            university_id = department[2]
+            university_id = self.department_index[department_id][2]
             
-            first_name = self.fake.first_name()
-            last_name = self.fake.last_name()
+            first_name = self._fake_value('first_name')
+            last_name = self._fake_value('last_name')
             gender = random.choice(['male', 'female'])
             
             # Рассчитываем дату приема
@@ -322,14 +678,14 @@ class EducationalDataGenerator:
                 first_name,
                 last_name,
                 gender,
-                self.fake.country(),
-                self._generate_unique_email(f"{first_name[0].lower()}.{last_name.lower()}"),
-                self._generate_unique_phone(),
+                self._fake_value('country'),
+                self._generate_unique_email(f"{first_name[0].lower()}.{last_name.lower()}", i - 1),
+                self._generate_unique_phone(2 * i),  # четные номера — преподаватели
                 random.choice(qualifications),
                 hire_date.isoformat(),
                 department_id,
                 university_id,
-                self.fake.text(80)
+                self._fake_value('text_80')
             ])
 
         headers = [
@@ -337,7 +693,8 @@ class EducationalDataGenerator:
             'email', 'phone', 'qualification', 'hire_date', 'department_id', 
             'university_id', 'biography'
         ]
-        self.teachers = self._save_to_csv('Teachers', headers, teachers)
+        self.teachers = self._save_table('Teachers', headers, teachers)
+        self.department_teachers = self._group_by(self.teachers, 9)
         return teachers
 
     def assign_department_heads(self):
@@ -345,18 +702,10 @@ class EducationalDataGenerator:
         logger.info("Назначение руководителей факультетов...")
         updated_departments = []
         
-        # Группируем преподавателей по факультетам
-        teachers_by_department = {}
-        for teacher in self.teachers:
-            dept_id = teacher[9]  # department_id
-            if dept_id not in teachers_by_department:
-                teachers_by_department[dept_id] = []
-            teachers_by_department[dept_id].append(teacher)
-        
         # Обновляем факультеты с назначенными руководителями
         for dept in self.departments:
             dept_id = dept[0]
-            teachers_in_dept = teachers_by_department.get(dept_id, [])
+            teachers_in_dept = self.department_teachers.get(dept_id, [])
             
             # Выбираем только профессоров и доцентов
             qualified_teachers = [t for t in teachers_in_dept if t[7] in ['Профессор', 'Доцент']]
@@ -373,15 +722,13 @@ class EducationalDataGenerator:
         
         # Сохраняем обновленные данные
         headers = ['department_id', 'department_name', 'university_id', 'head_of_department', 'created_at', 'updated_at']
-        self.departments = self._save_to_csv('Departments', headers, updated_departments)
+        self.departments = self._save_table('Departments', headers, updated_departments)
+        self._index_departments()
         return updated_departments
 
     def generate_students(self, count: int = 12000):
         """Генерирует данные студентов"""
         logger.info(f"Генерация {count} студентов...")
-        statuses = ['обучается', 'отчислен', 'академический_отпуск']
-        students = []
-        
         # Распределение студентов по группам (20-40 на группу)
         group_capacities = {}
         for group in self.study_groups:
@@ -426,8 +773,9 @@ class EducationalDataGenerator:
         # Сохраняем распределение студентов по факультетам
         self.department_students = {dept_id: 0 for dept_id in departments}
         
-        student_id = 1
-        for group in tqdm(self.study_groups, desc="Группы"):
+        # План: (student_id, department_id, university_id, group_id) для каждого студента
+        plan = []
+        for group in self.study_groups:
             group_id = group[0]
             capacity = group_capacities[group_id]
             
@@ -439,53 +787,60 @@ class EducationalDataGenerator:
                 department_id = department[0]
                 group_to_department[group_id] = department_id
             
-            department = next(dept for dept in self.departments if dept[0] == department_id)
-            university_id = department[2]
-            
+            university_id = self.department_index[department_id][2]
             for _ in range(capacity):
-                first_name = self.fake.first_name()
-                last_name = self.fake.last_name()
-                gender = random.choice(['male', 'female'])
-                
-                # Генерация даты зачисления
-                enrollment_date = self.fake.date_between(start_date='-6y', end_date='-6m')
-                
-                # Генерация даты рождения (16-25 лет на момент зачисления)
-                min_birth_date = enrollment_date - timedelta(days=365*25)
-                max_birth_date = enrollment_date - timedelta(days=365*16)
-                date_of_birth = self.fake.date_between_dates(min_birth_date, max_birth_date)
-                
-                # Генерация email и телефона
-                email = self._generate_unique_email(f"{first_name[0].lower()}.{last_name.lower()}.stud")
-                phone = self._generate_unique_phone() if random.random() > 0.1 else ""  # 10% без телефона
-                
-                students.append([
-                    student_id,
-                    first_name,
-                    last_name,
-                    gender,
-                    self.fake.country(),
-                    date_of_birth.isoformat(),
-                    email,
-                    phone,
-                    enrollment_date.isoformat(),
-                    department_id,
-                    university_id,
-                    group_id,
-                    random.choices(statuses, weights=[0.85, 0.1, 0.05])[0],
-                    self.fake.text(60)
-                ])
-                
+                plan.append((len(plan) + 1, department_id, university_id, group_id))
                 self.department_students[department_id] += 1
-                student_id += 1
+        
+        if self.workers:
+            rows = chain.from_iterable(self._run_shards('_shard_student_rows', plan, {}))
+        else:
+            rows = self._shard_student_rows(tqdm(plan, desc="Студенты"))
 
         headers = [
             'student_id', 'first_name', 'last_name', 'gender', 'nationality', 
             'date_of_birth', 'email', 'phone', 'enrollment_date', 'department_id', 
             'university_id', 'study_group_id', 'status', 'biography'
         ]
-        self.students = self._save_to_csv('Students', headers, students)
-        return students
+        self.students = self._write_table('Students', headers, self._chunked(rows), keep=STUDENT_KEYS)
+        return self.students
+
+    def _shard_student_rows(self, plan: Iterable[tuple]):
+        """Строки студентов по плану (student_id, department_id, university_id, group_id)"""
+        for student_id, department_id, university_id, group_id in plan:
+            first_name = self._fake_value('first_name')
+            last_name = self._fake_value('last_name')
+            gender = random.choice(['male', 'female'])
+            
+            # Генерация даты зачисления
+            enrollment_date = self.fake.date_between(start_date='-6y', end_date='-6m')
+            
+            # Генерация даты рождения (16-25 лет на момент зачисления)
+            min_birth_date = enrollment_date - timedelta(days=365*25)
+            max_birth_date = enrollment_date - timedelta(days=365*16)
+            date_of_birth = self.fake.date_between_dates(min_birth_date, max_birth_date)
+            
+            # Генерация email и телефона
+            email = self._generate_unique_email(f"{first_name[0].lower()}.{last_name.lower()}.stud", student_id - 1)
+            # 10% без телефона; нечетные номера — студенты
+            phone = self._generate_unique_phone(2 * student_id + 1) if random.random() > 0.1 else ""
+            
+            yield [
+                student_id,
+                first_name,
+                last_name,
+                gender,
+                self._fake_value('country'),
+                date_of_birth.isoformat(),
+                email,
+                phone,
+                enrollment_date.isoformat(),
+                department_id,
+                university_id,
+                group_id,
+                STUDENT_STATUS.sample(),
+                self._fake_value('text_60')
+            ]
 
     def generate_courses(self, count: int = 800):
         """Генерирует данные курсов"""
@@ -507,11 +862,8 @@ class EducationalDataGenerator:
         
         course_id = 1
         for dept_id, course_count in tqdm(courses_per_department.items(), desc="Факультеты"):
-            department = next(dept for dept in self.departments if dept[0] == dept_id)
-            university_id = department[2]
-            
-            # Выбираем преподавателей этого факультета
-            dept_teachers = [t for t in self.teachers if t[9] == dept_id]
+            # Преподаватели этого факультета (индекс строится в generate_teachers)
+            dept_teachers = self.department_teachers.get(dept_id, [])
             
             for _ in range(course_count):
                 # Выбираем случайного преподавателя
@@ -525,8 +877,8 @@ class EducationalDataGenerator:
                 course_type = random.choice(course_types)
                 courses.append([
                     course_id,
-                    f"{course_type} курс: {self.fake.catch_phrase()}",
-                    self.fake.text(80),
+                    f"{course_type} курс: {self._fake_value('catch_phrase')}",
+                    self._fake_value('text_80'),
                     random.randint(1, 5),  # credits
                     teacher_id,
                     dept_id,
@@ -539,7 +891,9 @@ class EducationalDataGenerator:
             'course_id', 'course_name', 'description', 'credits', 
             'teacher_id', 'department_id', 'start_date', 'end_date'
         ]
-        self.courses = self._save_to_csv('Courses', headers, courses)
+        self.courses = self._save_table('Courses', headers, courses)
+        self.course_index = self._build_index(self.courses)
+        self.department_courses = self._group_by(self.courses, 5)
         return courses
 
     def generate_schedule(self, count: int = 5000):
@@ -547,20 +901,21 @@ class EducationalDataGenerator:
         logger.info(f"Генерация {count} записей расписания...")
         schedule = []
         durations = [45, 60, 90, 120, 180]
-        days_of_week = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
+        # Слоты дня: начало 8:00-20:45 с шагом 15 минут x длительность
+        slots = [(time(hour, minute), duration)
+                 for hour in range(8, 21) for minute in (0, 15, 30, 45) for duration in durations]
+        # Занятость аудиторий и преподавателей: пары (classroom, class_time) не повторяются
+        allocator = SlotAllocator(classroom_names(6, range(100, 600)), self.seed)
         
-        # Распределение занятий по курсам
-        courses_count = {course[0]: 0 for course in self.courses}
-        classes_per_course = {
-            course_id: random.randint(5, 8) 
-            for course_id in courses_count.keys()
-        }
+        # Квоты занятий по курсам: 5-8 на курс, подогнанные ровно к count
+        classes_per_course = self._plan_quotas(
+            np.array([random.randint(5, 8) for _ in self.courses], dtype=np.int64), count)
         
         # Сохраняем расписание по курсам для посещаемости
-        self.course_schedules = {course_id: [] for course_id in courses_count.keys()}
+        self.course_schedules = {course[0]: [] for course in self.courses}
         
         schedule_id = 1
-        for course in tqdm(self.courses, desc="Курсы"):
+        for course, classes in tqdm(zip(self.courses, classes_per_course.tolist()), total=len(self.courses), desc="Курсы"):
             course_id = course[0]
             start_date = datetime.strptime(course[6], '%Y-%m-%d').date()
             end_date = datetime.strptime(course[7], '%Y-%m-%d').date()
@@ -568,315 +923,334 @@ class EducationalDataGenerator:
             # Выбираем преподавателя курса
             teacher_id = course[4]
             
-            # Генерация занятий для курса
-            for _ in range(min(classes_per_course[course_id], 10)):  # Ограничим максимум 10 занятий на курс
-                # Выбираем день недели
-                class_day = random.choice(days_of_week)
-                
-                # Генерация времени занятия
-                class_time = datetime.combine(
-                    self.fake.date_between_dates(start_date, end_date),
-                    datetime.strptime(f"{random.randint(8, 20)}:{random.choice([0, 15, 30, 45]):02d}", "%H:%M").time()
-                )
-                
+            # Свободные аудитория и время для каждого занятия курса
+            for classroom, class_time, duration in allocator.schedule(
+                    course_id, days_between(start_date, end_date), slots, classes, teacher=teacher_id):
                 schedule.append([
                     schedule_id,
                     course_id,
                     teacher_id,
-                    f"Корпус-{random.randint(1,6)} ауд-{random.randint(100,599)}",
+                    classroom,
                     class_time.isoformat(sep=' '),
-                    random.choice(durations)
+                    duration
                 ])
                 
                 self.course_schedules[course_id].append(schedule_id)
                 schedule_id += 1
-                
-                if schedule_id > count:
-                    break
-            if schedule_id > count:
-                break
 
-        # Дополняем до нужного количества
-        while schedule_id <= count:
-            course = random.choice(self.courses)
-            course_id = course[0]
-            teacher_id = course[4]
-            start_date = datetime.strptime(course[6], '%Y-%m-%d').date()
-            end_date = datetime.strptime(course[7], '%Y-%m-%d').date()
-            
-            class_time = datetime.combine(
-                self.fake.date_between_dates(start_date, end_date),
-                datetime.strptime(f"{random.randint(8, 20)}:{random.choice([0, 15, 30, 45]):02d}", "%H:%M").time()
-            )
-            
-            schedule.append([
-                schedule_id,
-                course_id,
-                teacher_id,
-                f"Корпус-{random.randint(1,6)} ауд-{random.randint(100,599)}",
-                class_time.isoformat(sep=' '),
-                random.choice(durations)
-            ])
-            
-            self.course_schedules[course_id].append(schedule_id)
-            schedule_id += 1
+        if len(schedule) < count:
+            logger.warning(f"Свободных аудиторий и времени хватило только на {len(schedule)} занятий из {count}")
 
         headers = [
             'schedule_id', 'course_id', 'teacher_id', 
             'classroom', 'class_time', 'duration'
         ]
-        self.schedule = self._save_to_csv('Schedule', headers, schedule)
+        self.schedule = self._save_table('Schedule', headers, schedule)
+        self.schedule_index = self._build_index(self.schedule)
         return schedule
 
+    def _build_course_pools(self):
+        """Строит пулы ID курсов по факультетам и университетам (один раз на генерацию)"""
+        university_courses = {}
+        for course in self.courses:
+            university_id = self.department_index[course[5]][2]
+            university_courses.setdefault(university_id, []).append(course[0])
+        
+        self.department_course_pool = {
+            dept_id: np.array([c[0] for c in courses], dtype=np.int64)
+            for dept_id, courses in self.department_courses.items()
+        }
+        self.university_course_pool = {
+            university_id: np.array(course_ids, dtype=np.int64)
+            for university_id, course_ids in university_courses.items()
+        }
+
+    @staticmethod
+    def _flatten_pools(pools: dict, size: int):
+        """Склеивает пулы в один массив и возвращает (значения, смещения, размеры) с индексом по ключу"""
+        offsets = np.zeros(size, dtype=np.int64)
+        sizes = np.zeros(size, dtype=np.int64)
+        chunks = []
+        position = 0
+        for key, pool in pools.items():
+            offsets[key] = position
+            sizes[key] = len(pool)
+            chunks.append(pool)
+            position += len(pool)
+        flat = np.concatenate(chunks) if chunks else np.empty(0, dtype=np.int64)
+        return flat, offsets, sizes
+
+    def _sample_student_courses(self, enrollments_per_student: np.ndarray):
+        """
+        Векторно выбирает курсы сразу для всех студентов.
+        Возвращает (позиции студентов в self.students, ID курсов) без повторов курса у одного студента
+        """
+        student_departments = self._column(self.students, 9)
+        student_universities = self._column(self.students, 10)
+        all_courses = np.array([c[0] for c in self.courses], dtype=np.int64)
+        
+        dept_flat, dept_offsets, dept_sizes = self._flatten_pools(
+            self.department_course_pool, max(self.department_index, default=0) + 1)
+        uni_flat, uni_offsets, uni_sizes = self._flatten_pools(
+            self.university_course_pool, max(self.university_index, default=0) + 1)
+        
+        # Одна строка на каждую попытку зачисления
+        owners = np.repeat(np.arange(len(self.students)), enrollments_per_student)
+        if len(owners) == 0 or len(all_courses) == 0:
+            return owners[:0], all_courses[:0]
+        departments = student_departments[owners]
+        universities = student_universities[owners]
+        dept_size = dept_sizes[departments]
+        uni_size = uni_sizes[universities]
+        
+        # Источник курса: факультет (80%), университет, иначе любой курс
+        use_dept = (dept_size > 0) & ((self.rng.random(len(owners)) < 0.8) | (uni_size == 0))
+        use_uni = ~use_dept & (uni_size > 0)
+        use_any = ~use_dept & ~use_uni
+        
+        u = self.rng.random(len(owners))
+        course_ids = np.empty(len(owners), dtype=np.int64)
+        course_ids[use_dept] = dept_flat[
+            dept_offsets[departments[use_dept]] + (u[use_dept] * dept_size[use_dept]).astype(np.int64)]
+        course_ids[use_uni] = uni_flat[
+            uni_offsets[universities[use_uni]] + (u[use_uni] * uni_size[use_uni]).astype(np.int64)]
+        course_ids[use_any] = all_courses[(u[use_any] * len(all_courses)).astype(np.int64)]
+        
+        # Убираем повторы курса у одного студента, сохраняя порядок выбора
+        keys = owners * (int(all_courses.max()) + 1) + course_ids
+        _, first = np.unique(keys, return_index=True)
+        first.sort()
+        return owners[first], course_ids[first]
+
+    def _plan_student_courses(self, owners: np.ndarray, course_ids: np.ndarray, count: int) -> list[list[int]]:
+        """
+        Курсы каждого студента, в сумме ровно count зачислений: выбранные заранее курсы
+        (owners, course_ids) урезаются или дополняются по квотам _plan_quotas. Емкость студента —
+        число различных курсов его факультета (или всех курсов, если у факультета их нет),
+        поэтому дополнение не может зациклиться на студентах, записанных на все доступные курсы
+        """
+        chosen = [[] for _ in range(len(self.students))]
+        for student_pos, course_id in zip(owners.tolist(), course_ids.tolist()):
+            chosen[student_pos].append(course_id)
+        
+        # Курсы для дополнения: еще не выбранные курсы факультета студента (или любые)
+        all_courses = [course[0] for course in self.courses]
+        department_pools = {dept_id: pool.tolist() for dept_id, pool in self.department_course_pool.items() if len(pool)}
+        available = []
+        for courses, dept_id in zip(chosen, self._column(self.students, 9).tolist()):
+            taken = set(courses)
+            available.append([c for c in department_pools.get(dept_id, all_courses) if c not in taken])
+        
+        base = np.array([len(courses) for courses in chosen], dtype=np.int64)
+        capacity = base + np.array([len(courses) for courses in available], dtype=np.int64)
+        quotas = self._plan_quotas(base, count, capacity)
+        
+        for student_pos, quota in enumerate(quotas.tolist()):
+            courses = chosen[student_pos]
+            if quota < len(courses):
+                del courses[quota:]
+            elif quota > len(courses):
+                courses.extend(random.sample(available[student_pos], quota - len(courses)))
+        return chosen
+
     def generate_enrollments(self, count: int = 40000):
         """Генерирует записи о зачислениях на курсы"""
         logger.info(f"Генерация {count} зачислений на курсы...")
-        enrollments = []
         
         # Создаем структуру для отслеживания зачислений
         self.student_enrollments = {student[0]: [] for student in self.students}
         
         # Распределяем курсы по студентам
-        enrollments_per_student = np.random.normal(3.3, 1.0, len(self.students))
+        enrollments_per_student = self.rng.normal(3.3, 1.0, len(self.students))
         enrollments_per_student = np.clip(enrollments_per_student, 1, 8).astype(int)
         
-        enrollment_id = 1
-        for i, student in tqdm(enumerate(self.students), total=len(self.students), desc="Студенты"):
-            student_id = student[0]
-            department_id = student[9]
-            university_id = student[10]
-            
-            # Выбираем курсы того же факультета (80%) или другого факультета того же университета (20%)
-            same_department_courses = [c for c in self.courses if c[5] == department_id]
-            same_university_courses = [c for c in self.courses if 
-                                      any(dept[2] == university_id for dept in self.departments if dept[0] == c[5])]
-            
-            # Выбираем курсы для студента
-            selected_courses = set()
-            for _ in range(enrollments_per_student[i]):
-                if same_department_courses and (random.random() < 0.8 or not same_university_courses):
-                    course = random.choice(same_department_courses)
-                elif same_university_courses:
-                    course = random.choice(same_university_courses)
-                else:
-                    course = random.choice(self.courses)
-                
-                # Убедимся, что курс не дублируется
-                if course[0] not in selected_courses:
-                    selected_courses.add(course[0])
-                    enrollments.append([
+        # Выбираем курсы того же факультета (80%) или другого факультета того же университета (20%)
+        self._build_course_pools()
+        owners, course_ids = self._sample_student_courses(enrollments_per_student)
+        # Подгоняем число зачислений ровно к count
+        student_courses = self._plan_student_courses(owners, course_ids, count)
+        
+        def enrollment_rows():
+            enrollment_id = 1
+            for student, courses in tqdm(zip(self.students, student_courses), total=len(self.students), desc="Студенты"):
+                student_id = student[0]
+                for course_id in courses:
+                    yield [
                         enrollment_id,
                         student_id,
-                        course[0],
+                        course_id,
                         student[8]  # enrollment_date
-                    ])
-                    self.student_enrollments[student_id].append(course[0])
+                    ]
                     enrollment_id += 1
-        
-        # Дополняем до нужного количества
-        while enrollment_id <= count:
-            student = random.choice(self.students)
-            student_id = student[0]
-            department_id = student[9]
-            
-            # Выбираем курс
-            same_department_courses = [c for c in self.courses if c[5] == department_id]
-            course = random.choice(same_department_courses) if same_department_courses else random.choice(self.courses)
-            
-            # Проверяем, что студент еще не записан на этот курс
-            if course[0] not in self.student_enrollments[student_id]:
-                enrollments.append([
-                    enrollment_id,
-                    student_id,
-                    course[0],
-                    student[8]  # enrollment_date
-                ])
-                self.student_enrollments[student_id].append(course[0])
-                enrollment_id += 1
+                self.student_enrollments[student_id].extend(courses)
 
         headers = ['enrollment_id', 'student_id', 'course_id', 'enrollment_date']
-        self.enrollments = self._save_to_csv('Enrollments', headers, enrollments)
-        return enrollments
+        self.enrollments = self._write_table(
+            'Enrollments', headers, self._chunked(enrollment_rows()), keep=ENROLLMENT_KEYS)
+        
+        # Студенты каждого курса (для оценок за задания)
+        self.course_students = {}
+        for student_id, course_id in zip(self._column(self.enrollments, 1).tolist(),
+                                         self._column(self.enrollments, 2).tolist()):
+            self.course_students.setdefault(course_id, []).append(student_id)
+        return self.enrollments
 
     def generate_grades(self, count: int = 40000):
         """Генерирует оценки студентов"""
         logger.info(f"Генерация {count} оценок...")
-        grades = []
-        exam_types = ['экзамен', 'зачет', 'курсовая']
+        headers = [
+            'grade_id', 'student_id', 'course_id', 'grade', 
+            'grade_date', 'exam_type', 'feedback'
+        ]
+        if self.engine == 'numpy':
+            chunks = self._iter_grades_columns(count, headers)
+        else:
+            chunks = self._chunked(self._iter_grades_rows(count))
+        self.grades = self._write_table('Grades', headers, chunks)
+        return self.grades
+
+    def _plan_grades(self, count: int) -> tuple[np.ndarray, np.ndarray, int]:
+        """
+        Различные сочетания (зачисление, тип экзамена) для count оценок, закодированные ключами
+        CombinationSpace: сначала по одной оценке на неповторяющиеся зачисления, затем недостающие
+        ключи из еще не выбранных. Возвращает (позиции зачислений в self.enrollments, номера типов
+        экзамена в EXAM_TYPES, число оценок первой части)
+        """
+        empty = np.empty(0, dtype=np.int64)
+        if not len(self.enrollments):
+            if count:
+                logger.warning(f"Нет зачислений: сгенерировано 0 оценок из {count}")
+            return empty, empty, 0
         
-        # Используем существующие зачисления как основу
-        grade_id = 1
-        for enrollment in tqdm(random.sample(self.enrollments, min(count, len(self.enrollments))), desc="Генерация оценок"):
+        space = CombinationSpace(len(self.enrollments), len(EXAM_TYPES))
+        first = self.rng.permutation(len(self.enrollments))[:count]
+        first_keys = space.encode(first, self.rng.integers(0, len(EXAM_TYPES), len(first)))
+        extra_keys = space.sample(self.rng, count - len(first), exclude=first_keys)
+        if len(first) + len(extra_keys) < count:
+            logger.warning(f"Различных сочетаний (студент, курс, тип экзамена) хватает только на "
+                           f"{len(first) + len(extra_keys)} оценок из {count}")
+        enrollment_pos, exam_pos = space.decode(np.concatenate([first_keys, extra_keys]))
+        return enrollment_pos, exam_pos, len(first)
+
+    def _iter_grades_rows(self, count: int):
+        """Построчно генерирует строки таблицы Grades"""
+        # Сначала неповторяющиеся зачисления, затем дополнительные оценки по другим типам экзамена
+        # (дата — в пределах ±30 дней от окончания курса)
+        enrollment_pos, exam_pos, first_count = self._plan_grades(count)
+        
+        plan = zip(enrollment_pos.tolist(), exam_pos.tolist())
+        for grade_id, (position, exam_index) in enumerate(tqdm(plan, total=len(enrollment_pos),
+                                                              desc="Генерация оценок"), 1):
+            enrollment = self.enrollments[position]
+            days_after_end = 0 if grade_id <= first_count else 30
             student_id = enrollment[1]
             course_id = enrollment[2]
             
             # Находим дату окончания курса
-            course = next(c for c in self.courses if c[0] == course_id)
+            course = self.course_index[course_id]
             end_date = datetime.strptime(course[7], '%Y-%m-%d').date()
             
             # Генерируем оценку и дату оценки
             grade = round(random.uniform(2.0, 5.0), 1)
             grade_date = self.fake.date_between_dates(
                 start_date=end_date - timedelta(days=30),
-                end_date=end_date
+                end_date=end_date + timedelta(days=days_after_end)
             )
             
-            grades.append([
+            yield [
                 grade_id,
                 student_id,
                 course_id,
                 grade,
                 grade_date.isoformat(),
-                random.choice(exam_types),
-                self.fake.sentence() if random.random() > 0.7 else ""
-            ])
-            grade_id += 1
-
-        # Дополняем до нужного количества
-        while grade_id <= count:
-            enrollment = random.choice(self.enrollments)
-            student_id = enrollment[1]
-            course_id = enrollment[2]
-            
-            course = next(c for c in self.courses if c[0] == course_id)
-            end_date = datetime.strptime(course[7], '%Y-%m-%d').date()
-            
-            grade = round(random.uniform(2.0, 5.0), 1)
-            grade_date = self.fake.date_between_dates(
-                start_date=end_date - timedelta(days=30),
-                end_date=end_date + timedelta(days=30)
-            )
-            
-            grades.append([
-                grade_id,
-                student_id,
-                course_id,
-                grade,
-                grade_date.isoformat(),
-                random.choice(exam_types),
-                self.fake.sentence() if random.random() > 0.7 else ""
-            ])
-            grade_id += 1
-
-        headers = [
-            'grade_id', 'student_id', 'course_id', 'grade', 
-            'grade_date', 'exam_type', 'feedback'
-        ]
-        self.grades = self._save_to_csv('Grades', headers, grades)
-        return grades
+                EXAM_TYPES[exam_index],
+                self._fake_value('sentence') if random.random() > 0.7 else ""
+            ]
 
     def generate_attendance(self, count: int = 120000):
         """Генерирует данные о посещаемости"""
         logger.info(f"Генерация {count} записей посещаемости...")
-        attendance = []
-        statuses = ['присутствовал', 'отсутствовал', 'уважительная_причина', 'опоздал']
-        
-        # Генерируем посещения на основе расписания и зачислений
-        attendance_id = 1
-        
-        # Для каждого студента
-        for student in tqdm(self.students, desc="Студенты"):
-            student_id = student[0]
-            
-            # Пропускаем отчисленных студентов
-            if student[12] != 'обучается':
-                continue
-                
-            enrolled_courses = self.student_enrollments.get(student_id, [])
-            
-            # Для каждого курса, на который записан студент
-            for course_id in enrolled_courses:
-                # Выбираем несколько занятий по этому курсу
-                course_schedules = self.course_schedules.get(course_id, [])
-                if not course_schedules:
-                    continue
-                    
-                # Студент посещает 70-90% занятий
-                attendance_per_course = max(1, int(len(course_schedules) * random.uniform(0.7, 0.9)))
-                selected_schedules = random.sample(course_schedules, min(attendance_per_course, len(course_schedules)))
-                
-                for schedule_id in selected_schedules:
-                    # Находим занятие
-                    schedule_item = next(s for s in self.schedule if s[0] == schedule_id)
-                    class_time = datetime.fromisoformat(schedule_item[4])
-                    
-                    # Статус посещения
-                    status = random.choices(
-                        statuses, 
-                        weights=[0.75, 0.15, 0.05, 0.05]
-                    )[0]
-                    
-                    # Время отметки
-                    check_time = None
-                    if status in ['присутствовал', 'опоздал']:
-                        # Случайное отклонение от времени занятия
-                        time_diff = random.randint(-30, 30)
-                        check_time = (class_time + timedelta(minutes=time_diff)).time()
-                    
-                    attendance.append([
-                        attendance_id,
-                        student_id,
-                        schedule_id,
-                        class_time.date().isoformat(),
-                        status,
-                        check_time.isoformat() if check_time else None,
-                        self.fake.sentence() if random.random() > 0.9 else None
-                    ])
-                    attendance_id += 1
-                    
-                    if attendance_id > count:
-                        break
-                if attendance_id > count:
-                    break
-            if attendance_id > count:
-                break
-
-        # Дополняем до нужного количества
-        while attendance_id <= count:
-            student = random.choice([s for s in self.students if s[12] == 'обучается'])
-            student_id = student[0]
-            
-            # Выбираем случайный курс студента
-            enrolled_courses = self.student_enrollments.get(student_id, [])
-            if not enrolled_courses:
-                continue
-                
-            course_id = random.choice(enrolled_courses)
-            course_schedules = self.course_schedules.get(course_id, [])
-            if not course_schedules:
-                continue
-                
-            schedule_id = random.choice(course_schedules)
-            schedule_item = next(s for s in self.schedule if s[0] == schedule_id)
-            class_time = datetime.fromisoformat(schedule_item[4])
-            
-            status = random.choices(
-                statuses, 
-                weights=[0.75, 0.15, 0.05, 0.05]
-            )[0]
-            
-            check_time = None
-            if status in ['присутствовал', 'опоздал']:
-                time_diff = random.randint(-30, 30)
-                check_time = (class_time + timedelta(minutes=time_diff)).time()
-            
-            attendance.append([
-                attendance_id,
-                student_id,
-                schedule_id,
-                class_time.date().isoformat(),
-                status,
-                check_time.isoformat() if check_time else None,
-                self.fake.sentence() if random.random() > 0.9 else None
-            ])
-            attendance_id += 1
-
         headers = [
             'attendance_id', 'student_id', 'schedule_id', 'attendance_date', 
             'status', 'check_time', 'notes'
         ]
-        self.attendance = self._save_to_csv('Attendance', headers, attendance)
-        return attendance
+        if self.engine == 'numpy':
+            chunks = self._iter_attendance_columns(count, headers)
+        else:
+            chunks = self._chunked(self._iter_attendance_rows(count))
+        self.attendance = self._write_table('Attendance', headers, chunks)
+        return self.attendance
+
+    def _plan_attendance(self, count: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        План посещаемости: пары (обучающийся студент, курс с занятиями) и квоты занятий на пару,
+        в сумме ровно count. Студент посещает 70-90% занятий каждого своего курса; квота не больше
+        числа занятий курса, поэтому занятия пары выбираются без повторов.
+        Возвращает (ID студентов, ID курсов, квоты)
+        """
+        student_ids = self._column(self.students, 0)
+        active_students = student_ids[self._column(self.students, 12, object) == 'обучается'].tolist()
+        pairs = [
+            (student_id, course_id)
+            for student_id in active_students
+            for course_id in self.student_enrollments.get(student_id, [])
+            if self.course_schedules.get(course_id)
+        ]
+        pair_students = np.array([p[0] for p in pairs], dtype=np.int64)
+        pair_courses = np.array([p[1] for p in pairs], dtype=np.int64)
+        sizes = np.array([len(self.course_schedules[course_id]) for _, course_id in pairs], dtype=np.int64)
+        base = np.maximum(1, (sizes * self.rng.uniform(0.7, 0.9, len(sizes))).astype(np.int64))
+        return pair_students, pair_courses, self._plan_quotas(base, count, sizes)
+
+    def _iter_attendance_rows(self, count: int):
+        """Построчно генерирует строки таблицы Attendance"""
+        # Посещения по плану: квоты занятий для пар (студент, курс) из расписания и зачислений
+        pair_students, pair_courses, quotas = self._plan_attendance(count)
+        plan = [plan_item for plan_item in zip(pair_students.tolist(), pair_courses.tolist(), quotas.tolist())
+                if plan_item[2]]
+        if self.workers:
+            state = {
+                'course_schedules': self.course_schedules,
+                'schedule_index': self.schedule_index
+            }
+            rows = chain.from_iterable(self._run_shards('_shard_attendance_rows', plan, state))
+        else:
+            rows = self._shard_attendance_rows(tqdm(plan, desc="Курсы студентов"))
+        
+        for attendance_id, row in enumerate(rows, 1):
+            yield [attendance_id, *row]
+
+    def _attendance_row(self, student_id: int, schedule_id: int) -> list:
+        """Строка посещаемости без attendance_id"""
+        # Находим занятие
+        schedule_item = self.schedule_index[schedule_id]
+        class_time = datetime.fromisoformat(schedule_item[4])
+        
+        # Статус посещения
+        status = ATTENDANCE_STATUS.sample()
+        
+        # Время отметки
+        check_time = None
+        if status in ['присутствовал', 'опоздал']:
+            # Случайное отклонение от времени занятия
+            time_diff = random.randint(-30, 30)
+            check_time = (class_time + timedelta(minutes=time_diff)).time()
+        
+        return [
+            student_id,
+            schedule_id,
+            class_time.date().isoformat(),
+            status,
+            check_time.isoformat() if check_time else None,
+            self._fake_value('sentence') if random.random() > 0.9 else None
+        ]
+
+    def _shard_attendance_rows(self, plan: Iterable[tuple]):
+        """Посещаемость по плану (студент, курс, число занятий) (строки без attendance_id)"""
+        for student_id, course_id, classes in plan:
+            # Различные занятия курса, которые посетил студент
+            for schedule_id in random.sample(self.course_schedules[course_id], classes):
+                yield self._attendance_row(student_id, schedule_id)
 
     def generate_assignments(self, count: int = 2000):
         """Генерирует учебные задания"""
@@ -884,23 +1258,22 @@ class EducationalDataGenerator:
         assignments = []
         assignment_types = ['лабораторная', 'практическая', 'доклад', 'реферат', 'другое']
         
-        # Распределение заданий по курсам
-        courses_count = {course[0]: 0 for course in self.courses}
-        assignments_per_course = {
-            course_id: random.randint(2, 4) 
-            for course_id in courses_count.keys()
-        }
+        # Квоты заданий по курсам: 2-4 основных на курс, подогнанные ровно к count;
+        # задания сверх основных — дополнительные
+        regular_per_course = np.array([random.randint(2, 4) for _ in self.courses], dtype=np.int64)
+        assignments_per_course = self._plan_quotas(regular_per_course, count)
         
         # Сохраняем задания по курсам для оценок
-        self.course_assignments = {course_id: [] for course_id in courses_count.keys()}
+        self.course_assignments = {course[0]: [] for course in self.courses}
         
         assignment_id = 1
-        for course in tqdm(self.courses, desc="Курсы"):
+        for course, regular, total in tqdm(zip(self.courses, regular_per_course.tolist(), assignments_per_course.tolist()),
+                                           total=len(self.courses), desc="Курсы"):
             course_id = course[0]
             start_date = datetime.strptime(course[6], '%Y-%m-%d').date()
             end_date = datetime.strptime(course[7], '%Y-%m-%d').date()
             
-            for _ in range(assignments_per_course[course_id]):
+            for number in range(total):
                 assignment_type = random.choice(assignment_types)
                 
                 # Срок сдачи - в период проведения курса
@@ -911,8 +1284,8 @@ class EducationalDataGenerator:
                     assignment_id,
                     course_id,
                     assignment_type,
-                    f"Задание по {assignment_type}",
-                    self.fake.text(60),
+                    f"Задание по {assignment_type}" if number < regular else "Дополнительное задание",
+                    self._fake_value('text_60'),
                     100.0,  # max_score
                     due_datetime.isoformat(sep=' '),
                     self.fake.date_time_this_year().isoformat(sep=' ')
@@ -921,126 +1294,234 @@ class EducationalDataGenerator:
                 self.course_assignments[course_id].append(assignment_id)
                 assignment_id += 1
 
-        # Дополняем до нужного количества
-        while assignment_id <= count:
-            course = random.choice(self.courses)
-            course_id = course[0]
-            start_date = datetime.strptime(course[6], '%Y-%m-%d').date()
-            end_date = datetime.strptime(course[7], '%Y-%m-%d').date()
-            
-            assignment_type = random.choice(assignment_types)
-            due_date = self.fake.date_between_dates(start_date, end_date)
-            due_datetime = datetime.combine(due_date, datetime.strptime("23:59", "%H:%M").time())
-            
-            assignments.append([
-                assignment_id,
-                course_id,
-                assignment_type,
-                f"Дополнительное задание",
-                self.fake.text(60),
-                100.0,
-                due_datetime.isoformat(sep=' '),
-                self.fake.date_time_this_year().isoformat(sep=' ')
-            ])
-            
-            self.course_assignments[course_id].append(assignment_id)
-            assignment_id += 1
-
         headers = [
             'assignment_id', 'course_id', 'assignment_type', 'title', 
             'description', 'max_score', 'due_date', 'created_at'
         ]
-        self.assignments = self._save_to_csv('Assignments', headers, assignments)
+        self.assignments = self._save_table('Assignments', headers, assignments)
         return assignments
 
     def generate_assignment_grades(self, count: int = 40000):
         """Генерирует оценки за задания"""
         logger.info(f"Генерация {count} оценок за задания...")
-        assignment_grades = []
+        headers = [
+            'assignment_grade_id', 'assignment_id', 'student_id', 'score', 
+            'submission_date', 'feedback', 'graded_at'
+        ]
+        if self.engine == 'numpy':
+            chunks = self._iter_assignment_grades_columns(count, headers)
+        else:
+            chunks = self._chunked(self._iter_assignment_grades_rows(count))
+        self.assignment_grades = self._write_table('AssignmentGrades', headers, chunks)
+        return self.assignment_grades
+
+    def _plan_assignment_grades(self, count: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Квоты оценок на задание, в сумме ровно count: задание выполняют 60-90% студентов курса;
+        квота не больше числа студентов курса, поэтому студенты задания выбираются без повторов.
+        Возвращает (число студентов курса, квоты) в порядке self.assignments
+        """
+        sizes = np.array([len(self.course_students.get(a[1], [])) for a in self.assignments], dtype=np.int64)
+        base = np.maximum(1, (sizes * self.rng.uniform(0.6, 0.9, len(sizes))).astype(np.int64))
+        return sizes, self._plan_quotas(base, count, sizes)
+
+    def _iter_assignment_grades_rows(self, count: int):
+        """Построчно генерирует строки таблицы AssignmentGrades"""
+        # Оценки по плану: квоты студентов для каждого задания
+        _, quotas = self._plan_assignment_grades(count)
+        plan = [(assignment, quota) for assignment, quota in zip(self.assignments, quotas.tolist()) if quota]
+        if self.workers:
+            state = {'course_students': self.course_students}
+            rows = chain.from_iterable(self._run_shards('_shard_assignment_grade_rows', plan, state))
+        else:
+            rows = self._shard_assignment_grade_rows(tqdm(plan, desc="Задания"))
         
-        # Генерируем оценки на основе заданий и студентов
-        assignment_grade_id = 1
+        for assignment_grade_id, row in enumerate(rows, 1):
+            yield [assignment_grade_id, *row]
+
+    def _assignment_grade_row(self, assignment_id: int, student_id: int, due_date: datetime) -> list:
+        """Строка оценки за задание без assignment_grade_id"""
+        # Дата сдачи (до или немного после срока)
+        submission_date = due_date + timedelta(days=random.randint(-7, 2))
         
-        # Для каждого задания
-        for assignment in tqdm(self.assignments, desc="Задания"):
-            assignment_id = assignment[0]
-            course_id = assignment[1]
-            
-            # Находим студентов, записанных на курс
-            course_enrollments = [e for e in self.enrollments if e[2] == course_id]
-            if not course_enrollments:
-                continue
-                
-            # Студенты, выполнившие задание (60-90%)
-            completion_rate = random.uniform(0.6, 0.9)
-            num_students = max(1, int(len(course_enrollments) * completion_rate))
-            selected_students = random.sample(course_enrollments, num_students)
-            
+        # Оценка (50-100% от максимальной)
+        score = round(random.uniform(50, 100), 2)
+        
+        # Дата оценки (1-7 дней после сдачи)
+        graded_at = submission_date + timedelta(days=random.randint(1, 7))
+        
+        return [
+            assignment_id,
+            student_id,
+            score,
+            submission_date.isoformat(sep=' '),
+            self._fake_value('sentence') if random.random() > 0.7 else None,
+            graded_at.isoformat(sep=' ')
+        ]
+
+    def _shard_assignment_grade_rows(self, plan: Iterable[tuple]):
+        """Оценки по плану (задание, число студентов) (строки без assignment_grade_id)"""
+        for assignment, students in plan:
             due_date = datetime.fromisoformat(assignment[6])
             
-            for enrollment in selected_students:
-                student_id = enrollment[1]
-                
-                # Дата сдачи (до или немного после срока)
-                submission_date = due_date + timedelta(days=random.randint(-7, 2))
-                
-                # Оценка (50-100% от максимальной)
-                score = round(random.uniform(50, 100), 2)
-                
-                # Дата оценки (1-7 дней после сдачи)
-                graded_at = submission_date + timedelta(days=random.randint(1, 7))
-                
-                assignment_grades.append([
-                    assignment_grade_id,
-                    assignment_id,
-                    student_id,
-                    score,
-                    submission_date.isoformat(sep=' '),
-                    self.fake.sentence() if random.random() > 0.7 else None,
-                    graded_at.isoformat(sep=' ')
-                ])
-                assignment_grade_id += 1
-                
-                if assignment_grade_id > count:
-                    break
-            if assignment_grade_id > count:
-                break
+            # Различные студенты курса, выполнившие задание
+            for student_id in random.sample(self.course_students[assignment[1]], students):
+                yield self._assignment_grade_row(assignment[0], student_id, due_date)
+
+    # ------------------------------------------------------------------
+    # Векторный движок (NumPy) для больших таблиц фактов
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _lookup_array(rows: list, value_pos: int, dtype) -> np.ndarray:
+        """Строит массив значений столбца с индексом по первичному ключу"""
+        ids = np.array([row[0] for row in rows], dtype=np.int64)
+        lookup = np.zeros(int(ids.max()) + 1 if len(ids) else 1, dtype=dtype)
+        lookup[ids] = np.array([row[value_pos] for row in rows], dtype=dtype)
+        return lookup
 
-        # Дополняем до нужного количества
-        while assignment_grade_id <= count:
-            assignment = random.choice(self.assignments)
-            assignment_id = assignment[0]
-            course_id = assignment[1]
+    @staticmethod
+    def _sample_within_groups(rng: np.random.Generator, group_sizes: np.ndarray, take: np.ndarray):
+        """
+        Выборка без возвращения внутри групп переменного размера.
+        Возвращает (номер группы, позиция внутри группы) для take[i] случайных элементов каждой группы i
+        """
+        total = int(group_sizes.sum())
+        owners = np.repeat(np.arange(len(group_sizes)), group_sizes)
+        ranks = np.arange(total) - np.repeat(np.cumsum(group_sizes) - group_sizes, group_sizes)
+        # Случайный порядок внутри каждой группы; сами группы остаются на местах
+        order = np.lexsort((rng.random(total), owners))
+        keep = ranks < take[owners]
+        return owners[keep], ranks[order][keep]
+
+    @staticmethod
+    def _format_datetimes(values: np.ndarray) -> np.ndarray:
+        """Форматирует datetime64 в строки 'YYYY-MM-DD HH:MM:SS'"""
+        return np.char.replace(np.datetime_as_string(values.astype('datetime64[s]')), 'T', ' ')
+
+    def _sample_sentences(self, mask: np.ndarray, empty=None) -> np.ndarray:
+        """Столбец случайных предложений из пула там, где mask истинна, и empty в остальных строках"""
+        column = np.full(len(mask), empty, dtype=object)
+        if self.pools is not None:
+            column[mask] = self.pools.sample_many('sentence', int(mask.sum()), self.rng)
+            return column
+        if self._sentence_pool is None:
+            self._sentence_pool = np.array([self.fake.sentence() for _ in range(SENTENCE_POOL_SIZE)], dtype=object)
+        column[mask] = self._sentence_pool[self.rng.integers(0, len(self._sentence_pool), int(mask.sum()))]
+        return column
+
+    def _group_blocks(self, group_sizes: np.ndarray) -> Iterator[tuple[int, int]]:
+        """Делит группы на последовательные блоки (start, stop) примерно по self.chunk_size элементов"""
+        total = int(group_sizes.sum())
+        bounds = np.searchsorted(np.cumsum(group_sizes), np.arange(self.chunk_size, total, self.chunk_size), side='right')
+        edges = [0, *bounds.tolist(), len(group_sizes)]
+        for start, stop in zip(edges[:-1], edges[1:]):
+            if stop > start:
+                yield start, stop
+
+    def _iter_grades_columns(self, count: int, headers: list[str]) -> Iterator[ColumnarTable]:
+        """Генерирует оценки студентов пачками столбцов"""
+        exam_types = np.array(EXAM_TYPES, dtype=object)
+        # Сначала неповторяющиеся зачисления, затем дополнительные оценки (как в построчной версии)
+        enrollment_pos, exam_pos, first_count = self._plan_grades(count)
+        if not len(enrollment_pos):
+            return
+        
+        enrollment_students = self._column(self.enrollments, 1)
+        enrollment_courses = self._column(self.enrollments, 2)
+        course_end = self._lookup_array(self.courses, 7, 'datetime64[D]')
+        
+        for start in range(0, len(enrollment_pos), self.chunk_size):
+            stop = min(start + self.chunk_size, len(enrollment_pos))
+            picked = enrollment_pos[start:stop]
+            size = stop - start
+            # Дата оценки: последние 30 дней курса (для дополнительных — ±30 дней от окончания)
+            first = np.arange(start, stop) < first_count
+            day_offsets = np.where(first, self.rng.integers(-30, 1, size), self.rng.integers(-30, 31, size))
+            course_ids = enrollment_courses[picked]
             
-            course_enrollments = [e for e in self.enrollments if e[2] == course_id]
-            if not course_enrollments:
-                continue
-                
-            enrollment = random.choice(course_enrollments)
-            student_id = enrollment[1]
+            yield ColumnarTable(headers, [
+                np.arange(start + 1, stop + 1),
+                enrollment_students[picked],
+                course_ids,
+                np.round(self.rng.uniform(2.0, 5.0, size), 1),
+                np.datetime_as_string(course_end[course_ids] + day_offsets),
+                exam_types[exam_pos[start:stop]],
+                self._sample_sentences(self.rng.random(size) > 0.7, empty="")
+            ])
+
+    def _iter_attendance_columns(self, count: int, headers: list[str]) -> Iterator[ColumnarTable]:
+        """Генерирует данные о посещаемости пачками столбцов"""
+        schedule_flat, schedule_offsets, schedule_sizes = self._flatten_pools(
+            {course_id: np.array(ids, dtype=np.int64) for course_id, ids in self.course_schedules.items()},
+            max(self.course_index, default=0) + 1)
+        class_times = self._lookup_array(self.schedule, 4, 'datetime64[m]')
+        
+        # Пары (студент, курс) и квоты занятий — тот же план, что в построчной версии
+        pair_students, pair_courses, quotas = self._plan_attendance(count)
+        sizes = schedule_sizes[pair_courses]
+        
+        def build(first_id: int, owners: np.ndarray, positions: np.ndarray) -> ColumnarTable:
+            size = len(owners)
+            schedule_ids = schedule_flat[schedule_offsets[pair_courses[owners]] + positions]
+            class_time = class_times[schedule_ids]
+            status_codes = ATTENDANCE_STATUS.sample_codes(self.rng, size)
             
-            due_date = datetime.fromisoformat(assignment[6])
-            submission_date = due_date + timedelta(days=random.randint(-7, 2))
-            score = round(random.uniform(50, 100), 2)
-            graded_at = submission_date + timedelta(days=random.randint(1, 7))
+            # Время отметки только для присутствовавших и опоздавших: ±30 минут от начала занятия
+            check_time = class_time + self.rng.integers(-30, 31, size)
+            minute_of_day = (check_time - check_time.astype('datetime64[D]')).astype(np.int64)
+            checked = np.isin(status_codes, [ATTENDANCE_STATUS.values.index('присутствовал'),
+                                             ATTENDANCE_STATUS.values.index('опоздал')])
             
-            assignment_grades.append([
-                assignment_grade_id,
-                assignment_id,
-                student_id,
-                score,
-                submission_date.isoformat(sep=' '),
-                self.fake.sentence() if random.random() > 0.7 else None,
-                graded_at.isoformat(sep=' ')
+            return ColumnarTable(headers, [
+                np.arange(first_id, first_id + size),
+                pair_students[owners],
+                schedule_ids,
+                np.datetime_as_string(class_time.astype('datetime64[D]')),
+                ATTENDANCE_STATUS.take(status_codes),
+                np.where(checked, TIMES_OF_DAY[minute_of_day], None),
+                self._sample_sentences(self.rng.random(size) > 0.9)
             ])
-            assignment_grade_id += 1
+        
+        produced = 0
+        for start, stop in self._group_blocks(quotas):
+            owners, positions = self._sample_within_groups(self.rng, sizes[start:stop], quotas[start:stop])
+            yield build(produced + 1, owners + start, positions)
+            produced += len(owners)
 
-        headers = [
-            'assignment_grade_id', 'assignment_id', 'student_id', 'score', 
-            'submission_date', 'feedback', 'graded_at'
-        ]
-        self.assignment_grades = self._save_to_csv('AssignmentGrades', headers, assignment_grades)
-        return assignment_grades
+    def _iter_assignment_grades_columns(self, count: int, headers: list[str]) -> Iterator[ColumnarTable]:
+        """Генерирует оценки за задания пачками столбцов"""
+        enrolled_flat, enrolled_offsets, enrolled_sizes = self._flatten_pools(
+            {course_id: np.array(student_ids, dtype=np.int64)
+             for course_id, student_ids in self.course_students.items()},
+            max(self.course_index, default=0) + 1)
+        assignment_ids = np.array([a[0] for a in self.assignments], dtype=np.int64)
+        assignment_courses = np.array([a[1] for a in self.assignments], dtype=np.int64)
+        due_dates = np.array([a[6] for a in self.assignments], dtype='datetime64[s]')
+        # Квоты студентов по заданиям — тот же план, что в построчной версии
+        sizes, quotas = self._plan_assignment_grades(count)
+        
+        def build(first_id: int, owners: np.ndarray, positions: np.ndarray) -> ColumnarTable:
+            size = len(owners)
+            # Сдача за 7 дней до срока или до 2 дней после, проверка через 1-7 дней
+            submission_date = due_dates[owners] + self.rng.integers(-7, 3, size).astype('timedelta64[D]')
+            graded_at = submission_date + self.rng.integers(1, 8, size).astype('timedelta64[D]')
+            
+            return ColumnarTable(headers, [
+                np.arange(first_id, first_id + size),
+                assignment_ids[owners],
+                enrolled_flat[enrolled_offsets[assignment_courses[owners]] + positions],
+                np.round(self.rng.uniform(50, 100, size), 2),
+                self._format_datetimes(submission_date),
+                self._sample_sentences(self.rng.random(size) > 0.7),
+                self._format_datetimes(graded_at)
+            ])
+        
+        produced = 0
+        for start, stop in self._group_blocks(quotas):
+            owners, positions = self._sample_within_groups(self.rng, sizes[start:stop], quotas[start:stop])
+            yield build(produced + 1, owners + start, positions)
+            produced += len(owners)
 
     def generate_all_data(self):
         """Генерирует все данные для базы"""
@@ -1076,8 +1557,58 @@ class EducationalDataGenerator:
             'assignment_grades': len(self.assignment_grades)
         }
 
+# Генератор рабочего процесса пула (создается инициализатором пула)
+_worker_generator = None
+
+
+def _init_shard_worker(output_dir: str, state: dict):
+    """Инициализатор рабочего процесса: создает генератор и загружает в него общие структуры"""
+    global _worker_generator
+    _worker_generator = EducationalDataGenerator(output_dir)
+    for name, value in state.items():
+        setattr(_worker_generator, name, value)
+
+
+def _run_shard(task: tuple) -> Path:
+    """Генерирует одну шарду во временный файл (пачки строк в pickle) и возвращает путь к нему"""
+    method, seed, items, part_path = task
+    _worker_generator._reseed(seed)
+    rows = getattr(_worker_generator, method)(items)
+    with open(part_path, 'wb') as f:
+        for chunk in _worker_generator._chunked(rows):
+            pickle.dump(chunk, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return part_path
+
+
+def parse_args() -> argparse.Namespace:
+    """Парсинг аргументов командной строки"""
+    parser = argparse.ArgumentParser(description='Генератор CSV-данных для образовательного учреждения')
+    parser.add_argument('--output-dir', default='edu_data', help='Каталог для CSV-файлов')
+    parser.add_argument('--engine', choices=ENGINES, default='python',
+                        help='Движок генерации оценок, посещаемости и оценок за задания')
+    parser.add_argument('--stream', action='store_true',
+                        help='Потоковая запись CSV пачками без хранения больших таблиц в памяти')
+    parser.add_argument('--chunk-size', type=int, default=100000, help='Размер пачки строк')
+    parser.add_argument('--seed', type=int, default=42, help='Seed для генерации случайных данных')
+    parser.add_argument('--workers', type=int, default=0,
+                        help='Число процессов для шардированной генерации (0 — последовательно, без шард)')
+    parser.add_argument('--shard-size', type=int, default=10000, help='Число элементов в одной шарде')
+    parser.add_argument('--pool-dir', default=None,
+                        help='Каталог пулов значений Faker (строятся при первом запуске, затем переиспользуются)')
+    parser.add_argument('--pool-size', type=int, default=10000, help='Число значений в каждом пуле Faker')
+    parser.add_argument('--format', choices=FORMATS, default='csv', help='Формат выходных файлов')
+    parser.add_argument('--compression', default='zstd',
+                        help='Сжатие Parquet: zstd, snappy, gzip, brotli, lz4, none')
+    parser.add_argument('--row-group-size', type=int, default=100000, help='Строк в группе строк Parquet')
+    return parser.parse_args()
+
 if __name__ == "__main__":
-    generator = EducationalDataGenerator()
+    args = parse_args()
+    generator = EducationalDataGenerator(
+        args.output_dir, engine=args.engine, stream=args.stream, chunk_size=args.chunk_size,
+        seed=args.seed, workers=args.workers, shard_size=args.shard_size,
+        pool_dir=args.pool_dir, pool_size=args.pool_size,
+        output_format=args.format, compression=args.compression, row_group_size=args.row_group_size)
     stats = generator.generate_all_data()
     
     # Выводим статистику
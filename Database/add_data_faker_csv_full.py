@@ -12,6 +12,8 @@ from pathlib import Path
 from faker import Faker
 from tqdm import tqdm
 
+from samplers import AliasSampler
+
 # Настройка логирования
 logging.basicConfig(
     level=logging.INFO,
@@ -209,7 +211,7 @@ class DataGenerator:
         """Генерирует данные о посещаемости"""
         logger.info("Генерация посещаемости...")
         data = []
-        statuses = ['present', 'absent', 'excused']
+        statuses = AliasSampler(['present', 'absent', 'excused'], [0.8, 0.15, 0.05])
         
         for enrollment in enrollments:
             student_id = enrollment[0]
@@ -223,7 +225,7 @@ class DataGenerator:
                     student_id,
                     lesson[0],  # schedule_id
                     lesson[3].date(),  # class_time как date
-                    random.choices(statuses, weights=[0.8, 0.15, 0.05])[0]
+                    statuses.sample()
                 ))
 
         headers = ['student_id', 'schedule_id', 'attendance_date', 'status']
@@ -9,6 +9,8 @@ import textwrap
 import logging
 import sys
 
+from samplers import ATTENDANCE_STATUS
+
 # Настройка логгера
 logging.basicConfig(
     level=logging.INFO,
@@ -444,14 +446,14 @@ def generate_grades():
 
 def generate_attendance():
     logger.info("Генерация посещаемости...")
-    statuses = ['present', 'absent']
-    probabilities = [0.85, 0.10, 0.05]
+    # Распределение samplers.ATTENDANCE_STATUS с англоязычными названиями статусов
+    statuses = ATTENDANCE_STATUS.relabel(['present', 'absent', 'excused', 'late'])
     
     batch = []
     for _ in range(CONFIG["num_attendance"]):
         student_id = random.choice(cache["student_ids"])
         schedule_id = random.choice(cache["schedule_ids"])
-        status = random.choices(statuses, weights=probabilities)[0]
+        status = statuses.sample()
         attendance_date = fake.date_between(
             start_date=CONFIG["academic_year"]["start"],
             end_date=CONFIG["academic_year"]["end"]
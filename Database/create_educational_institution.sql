@@ -92,12 +92,14 @@ CREATE TABLE Students (
     study_group_id INT NOT NULL COMMENT 'Учебная группа (внешний ключ к Study_Groups)',
     status ENUM('обучается', 'отчислен', 'академический_отпуск') NOT NULL DEFAULT 'обучается' COMMENT 'Статус студента',
     biography TEXT COMMENT 'Краткая биография студента',
+    updated_at DATETIME(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6) COMMENT 'Дата последнего изменения записи',
     FOREIGN KEY (department_id) REFERENCES Departments(department_id) ON DELETE RESTRICT,
     FOREIGN KEY (university_id) REFERENCES Universities(university_id) ON DELETE CASCADE,
     FOREIGN KEY (study_group_id) REFERENCES Study_Groups(study_group_id) ON DELETE RESTRICT,
     CONSTRAINT chk_student_age CHECK (date_of_birth <= DATE_SUB(enrollment_date, INTERVAL 16 YEAR)),
     INDEX idx_student_name (last_name, first_name) USING BTREE,
-    INDEX idx_student_department (department_id) USING BTREE
+    INDEX idx_student_department (department_id) USING BTREE,
+    INDEX idx_student_updated (updated_at) USING BTREE
 ) ENGINE=InnoDB ROW_FORMAT=DYNAMIC;
 
 -- ***************************************************************
@@ -161,10 +163,12 @@ CREATE TABLE Grades (
     grade_date DATE NOT NULL COMMENT 'Дата получения оценки',
     exam_type ENUM('экзамен', 'зачет', 'курсовая') NOT NULL COMMENT 'Тип аттестации',
     feedback TEXT COMMENT 'Комментарий преподавателя',
+    updated_at DATETIME(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6) COMMENT 'Дата последнего изменения записи',
     FOREIGN KEY (student_id) REFERENCES Students(student_id) ON DELETE CASCADE,
     FOREIGN KEY (course_id) REFERENCES Courses(course_id) ON DELETE CASCADE,
     CONSTRAINT chk_grade_range CHECK (grade BETWEEN 2.0 AND 5.0),
-    UNIQUE INDEX idx_unique_grade (student_id, course_id, exam_type)
+    UNIQUE INDEX idx_unique_grade (student_id, course_id, exam_type),
+    INDEX idx_grade_updated (updated_at)
 ) ENGINE=InnoDB ROW_FORMAT=DYNAMIC;
 
 -- ***************************************************************
@@ -178,10 +182,12 @@ CREATE TABLE Attendance (
     status ENUM('присутствовал', 'отсутствовал', 'уважительная_причина', 'опоздал') NOT NULL COMMENT 'Статус посещения',
     check_time TIME COMMENT 'Время отметки',
     notes TEXT COMMENT 'Комментарии к посещаемости',
+    updated_at DATETIME(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6) COMMENT 'Дата последнего изменения записи',
     FOREIGN KEY (student_id) REFERENCES Students(student_id) ON DELETE CASCADE,
     FOREIGN KEY (schedule_id) REFERENCES Schedule(schedule_id) ON DELETE CASCADE,
     INDEX idx_attendance_date (attendance_date),
-    INDEX idx_attendance_status (status)
+    INDEX idx_attendance_status (status),
+    INDEX idx_attendance_updated (updated_at)
 ) ENGINE=InnoDB ROW_FORMAT=DYNAMIC;
 
 -- ***************************************************************
@@ -212,11 +218,13 @@ CREATE TABLE AssignmentGrades (
     submission_date DATETIME COMMENT 'Дата и время сдачи задания',
     feedback TEXT COMMENT 'Комментарий преподавателя',
     graded_at DATETIME(6) DEFAULT CURRENT_TIMESTAMP(6) COMMENT 'Дата выставления оценки',
+    updated_at DATETIME(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6) COMMENT 'Дата последнего изменения записи',
     FOREIGN KEY (assignment_id) REFERENCES Assignments(assignment_id) ON DELETE CASCADE,
     FOREIGN KEY (student_id) REFERENCES Students(student_id) ON DELETE CASCADE,
     CONSTRAINT chk_score_range CHECK (score BETWEEN 0.00 AND 100.00),
     INDEX idx_assignment_grades (student_id, assignment_id),
-    INDEX idx_submission_date (submission_date)
+    INDEX idx_submission_date (submission_date),
+    INDEX idx_assignment_grade_updated (updated_at)
 ) ENGINE=InnoDB ROW_FORMAT=DYNAMIC;
 
 -- *******************************************************
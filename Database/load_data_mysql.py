@@ -0,0 +1,266 @@
+"""
+Массовая загрузка CSV-файлов генераторов в MySQL.
+
+Таблицы загружаются в порядке зависимостей через LOAD DATA LOCAL INFILE: сервер
+читает файл потоком, без построчных INSERT и без загрузки файла в память Python.
+Если LOAD DATA LOCAL запрещен (local_infile=OFF на сервере или в клиенте), используется
+запасной путь: многострочные INSERT, размер которых подбирается под max_allowed_packet.
+На время загрузки каждой таблицы проверки внешних ключей и уникальности отключаются.
+
+Установка необходимых библиотек:
+~ pip install mysql-connector-python python-dotenv
+
+Пример запуска:
+~ python load_data_mysql.py --data-dir edu_data --password ... --truncate
+"""
+
+import os
+import csv
+import sys
+import time
+import logging
+import argparse
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import mysql.connector
+from mysql.connector import Error
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+logger = logging.getLogger(__name__)
+
+# Порядок загрузки: родительские таблицы раньше дочерних
+# (цикл Departments.head_of_department <-> Teachers.department_id разрывается отключением FK)
+TABLE_ORDER = [
+    'Universities', 'Study_Groups', 'Departments', 'Teachers', 'Students',
+    'Courses', 'Schedule', 'Enrollments', 'Grades', 'Attendance',
+    'Assignments', 'AssignmentGrades'
+]
+
+METHODS = ('load', 'insert')
+
+# Коды ошибок MySQL, означающие, что LOAD DATA LOCAL запрещен
+LOCAL_INFILE_DISABLED = {1148, 2068, 3948, 3950}
+
+# Доля max_allowed_packet, занимаемая одним многострочным INSERT
+PACKET_FILL = 0.8
+
+
+def line_terminator(path: Path) -> str:
+    """Окончание строк CSV: csv.writer пишет \\r\\n, pandas и ручная запись — \\n"""
+    with open(path, 'rb') as f:
+        first_line = f.readline()
+    return '\\r\\n' if first_line.endswith(b'\r\n') else '\\n'
+
+
+def csv_file_name(table: str) -> str:
+    """Имя CSV в snake_case (так называют файлы генераторы add_data_faker_csv*.py)"""
+    name = ''.join(f"_{c.lower()}" if c.isupper() else c for c in table).lstrip('_')
+    return f"{name.replace('__', '_')}.csv"
+
+
+class BulkLoader:
+    """Загрузка каталога CSV-файлов в MySQL таблица за таблицей"""
+
+    def __init__(self, db_config: Dict, data_dir: str, method: str = 'load'):
+        if method not in METHODS:
+            raise ValueError(f"Неизвестный способ загрузки: {method}")
+        self.db_config = db_config
+        self.data_dir = Path(data_dir)
+        self.method = method
+        self.connection = mysql.connector.connect(
+            **db_config,
+            allow_local_infile=True,
+            autocommit=False
+        )
+        self.cursor = self.connection.cursor()
+
+    def close(self):
+        self.cursor.close()
+        self.connection.close()
+
+    def find_csv(self, table: str) -> Optional[Path]:
+        """Ищет CSV таблицы: Table.csv (add_data_faker_csv_full-v2.py) или table.csv"""
+        for name in (f"{table}.csv", csv_file_name(table)):
+            path = self.data_dir / name
+            if path.exists():
+                return path
+        return None
+
+    def _set_checks(self, enabled: bool):
+        """Включает/отключает проверки внешних ключей и уникальности в текущей сессии"""
+        value = 1 if enabled else 0
+        self.cursor.execute(f"SET foreign_key_checks = {value}")
+        self.cursor.execute(f"SET unique_checks = {value}")
+
+    def _nullable_columns(self, table: str) -> set:
+        """Столбцы, допускающие NULL: пустое значение в CSV загружается в них как NULL"""
+        self.cursor.execute(f"SHOW COLUMNS FROM `{table}`")
+        return {row[0] for row in self.cursor.fetchall() if row[2] == 'YES'}
+
+    def truncate(self, tables: List[str]):
+        """Очищает таблицы в обратном порядке зависимостей"""
+        self._set_checks(False)
+        try:
+            for table in reversed(tables):
+                self.cursor.execute(f"TRUNCATE TABLE `{table}`")
+        finally:
+            self._set_checks(True)
+        self.connection.commit()
+        logger.info("Таблицы очищены")
+
+    def load_table(self, table: str, path: Path) -> int:
+        """Загружает один CSV в таблицу; возвращает число загруженных строк"""
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            headers = next(csv.reader(f))
+        nullable = self._nullable_columns(table)
+
+        self._set_checks(False)
+        try:
+            if self.method == 'load':
+                try:
+                    count = self._load_data_infile(table, path, headers, nullable)
+                except Error as e:
+                    if e.errno not in LOCAL_INFILE_DISABLED:
+                        raise
+                    logger.warning(f"LOAD DATA LOCAL недоступен ({e.msg}), используются многострочные INSERT")
+                    self.connection.rollback()
+                    self.method = 'insert'
+                    count = self._insert_rows(table, path, headers, nullable)
+            else:
+                count = self._insert_rows(table, path, headers, nullable)
+            self.connection.commit()
+        except Error:
+            self.connection.rollback()
+            raise
+        finally:
+            self._set_checks(True)
+        return count
+
+    def _load_data_infile(self, table: str, path: Path, headers: List[str], nullable: set) -> int:
+        """
+        LOAD DATA LOCAL INFILE: пустые значения nullable-столбцов превращаются в NULL.
+        CSV пишется csv.writer (RFC 4180: кавычки удваиваются, обратная косая черта не
+        экранируется), поэтому экранирование '\\' по умолчанию отключено через ESCAPED BY ''
+        """
+        targets = [f"@`{column}`" if column in nullable else f"`{column}`" for column in headers]
+        assignments = [f"`{column}` = NULLIF(@`{column}`, '')" for column in headers if column in nullable]
+        query = (
+            f"LOAD DATA LOCAL INFILE %s INTO TABLE `{table}` "
+            "CHARACTER SET utf8mb4 "
+            "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '' "
+            f"LINES TERMINATED BY '{line_terminator(path)}' "
+            "IGNORE 1 LINES "
+            f"({', '.join(targets)})"
+        )
+        if assignments:
+            query += f" SET {', '.join(assignments)}"
+        self.cursor.execute(query, (str(path.resolve()),))
+        return self.cursor.rowcount
+
+    def _max_packet(self) -> int:
+        self.cursor.execute("SELECT @@max_allowed_packet")
+        return int(self.cursor.fetchone()[0])
+
+    def _iter_statement_rows(self, path: Path, nullable_positions: set,
+                             packet_limit: int) -> Iterator[List[Tuple]]:
+        """Читает CSV потоком и отдает пачки строк, каждая из которых укладывается в packet_limit"""
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            reader = csv.reader(f)
+            next(reader)
+            batch, size = [], 0
+            for row in reader:
+                values = tuple(
+                    None if value == '' and i in nullable_positions else value
+                    for i, value in enumerate(row)
+                )
+                # Оценка размера строки в запросе: значения + кавычки и разделители
+                row_size = sum(len(value) for value in row) * 2 + 4 * len(row)
+                if batch and size + row_size > packet_limit:
+                    yield batch
+                    batch, size = [], 0
+                batch.append(values)
+                size += row_size
+            if batch:
+                yield batch
+
+    def _insert_rows(self, table: str, path: Path, headers: List[str], nullable: set) -> int:
+        """Запасной путь: многострочные INSERT размером до PACKET_FILL * max_allowed_packet"""
+        columns = ', '.join(f"`{column}`" for column in headers)
+        placeholder = f"({', '.join(['%s'] * len(headers))})"
+        nullable_positions = {i for i, column in enumerate(headers) if column in nullable}
+        packet_limit = int(self._max_packet() * PACKET_FILL)
+
+        count = 0
+        for batch in self._iter_statement_rows(path, nullable_positions, packet_limit):
+            query = f"INSERT INTO `{table}` ({columns}) VALUES {', '.join([placeholder] * len(batch))}"
+            self.cursor.execute(query, [value for row in batch for value in row])
+            count += len(batch)
+        return count
+
+    def load_all(self, tables: List[str], truncate: bool = False):
+        """Загружает все найденные CSV в порядке TABLE_ORDER"""
+        plan = [(table, self.find_csv(table)) for table in tables]
+        missing = [table for table, path in plan if path is None]
+        if missing:
+            logger.warning(f"CSV не найдены, таблицы пропущены: {', '.join(missing)}")
+        plan = [(table, path) for table, path in plan if path is not None]
+
+        if truncate:
+            self.truncate([table for table, _ in plan])
+
+        total_start = time.time()
+        for table, path in plan:
+            start = time.time()
+            count = self.load_table(table, path)
+            elapsed = time.time() - start
+            logger.info(f"{table}: {count} строк за {elapsed:.1f} сек ({self.method})")
+        logger.info(f"Загрузка завершена за {time.time() - total_start:.1f} сек")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Массовая загрузка CSV-файлов генератора в MySQL')
+    parser.add_argument('--data-dir', default='edu_data', help='Каталог с CSV-файлами')
+    parser.add_argument('--host', default='localhost', help='Хост базы данных')
+    parser.add_argument('--port', type=int, default=3306, help='Порт базы данных')
+    parser.add_argument('--user', default=os.getenv('DB_USER'), help='Пользователь базы данных')
+    parser.add_argument('--password', default=os.getenv('DB_PASSWORD'), help='Пароль базы данных')
+    parser.add_argument('--db', default='educational_institution', help='Название базы данных')
+    parser.add_argument('--method', choices=METHODS, default='load',
+                        help='load: LOAD DATA LOCAL INFILE; insert: многострочные INSERT')
+    parser.add_argument('--tables', nargs='+', choices=TABLE_ORDER, default=TABLE_ORDER,
+                        help='Загружаемые таблицы (порядок зависимостей сохраняется)')
+    parser.add_argument('--truncate', action='store_true', help='Очистить таблицы перед загрузкой')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    db_config = {
+        'host': args.host,
+        'port': args.port,
+        'user': args.user,
+        'password': args.password,
+        'database': args.db,
+        'charset': 'utf8mb4'
+    }
+    tables = [table for table in TABLE_ORDER if table in args.tables]
+    loader = BulkLoader(db_config, args.data_dir, method=args.method)
+    try:
+        loader.load_all(tables, truncate=args.truncate)
+    except Error as e:
+        logger.error(f"Ошибка загрузки: {e}")
+        raise
+    finally:
+        loader.close()
+
+
+if __name__ == "__main__":
+    main()
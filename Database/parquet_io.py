@@ -0,0 +1,208 @@
+"""
+Запись таблиц в Parquet с типами столбцов из схемы MySQL.
+
+Типы берутся из create_educational_institution.sql (генераторы без подключения к базе)
+или из information_schema (экспорт из живой базы): DATE -> date32, DATETIME(n) -> timestamp,
+DECIMAL(p,s) -> decimal128(p,s), ENUM -> словарное кодирование, TINYINT/SMALLINT UNSIGNED ->
+uint8/uint16 и т.д. Столбцы, которых нет в схеме, записываются строками.
+
+Установка необходимых библиотек:
+~ pip install pyarrow
+"""
+
+import re
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Схема базы данных, из которой берутся типы столбцов
+SCHEMA_SQL = Path(__file__).parent / 'create_educational_institution.sql'
+
+COMPRESSIONS = ('zstd', 'snappy', 'gzip', 'brotli', 'lz4', 'none')
+
+# Строк в одной группе строк Parquet
+ROW_GROUP_SIZE = 100000
+
+INTEGER_TYPES = {
+    ('tinyint', False): pa.int8(), ('tinyint', True): pa.uint8(),
+    ('smallint', False): pa.int16(), ('smallint', True): pa.uint16(),
+    ('mediumint', False): pa.int32(), ('mediumint', True): pa.uint32(),
+    ('int', False): pa.int32(), ('int', True): pa.uint32(),
+    ('bigint', False): pa.int64(), ('bigint', True): pa.uint64(),
+}
+
+# Строки, которые в определении таблицы не являются столбцами
+CONSTRAINT_PREFIXES = ('PRIMARY', 'FOREIGN', 'UNIQUE', 'INDEX', 'KEY', 'CONSTRAINT', 'CHECK')
+
+
+def load_sql_schema(path: Path = SCHEMA_SQL) -> dict[str, dict[str, str]]:
+    """Типы столбцов из CREATE TABLE: {таблица: {столбец: тип MySQL}}"""
+    text = Path(path).read_text(encoding='utf-8')
+    schema = {}
+    for table, body in re.findall(r'CREATE TABLE (\w+) \((.*?)\n\)', text, flags=re.S):
+        columns = {}
+        for line in body.splitlines():
+            line = line.strip()
+            if not line or line.startswith(CONSTRAINT_PREFIXES) or line.startswith('--'):
+                continue
+            match = re.match(r"(\w+)\s+(ENUM\([^)]*\)|\w+(?:\([\d,\s]+\))?(?:\s+UNSIGNED)?)", line, flags=re.I)
+            if match:
+                columns[match.group(1)] = match.group(2).lower()
+        schema[table] = columns
+    return schema
+
+
+def load_mysql_schema(cursor, database: str) -> dict[str, dict[str, str]]:
+    """Типы столбцов из information_schema живой базы: {таблица: {столбец: тип MySQL}}"""
+    cursor.execute(
+        "SELECT table_name, column_name, column_type FROM information_schema.columns "
+        "WHERE table_schema = %s ORDER BY table_name, ordinal_position",
+        (database,)
+    )
+    schema = {}
+    for table, column, column_type in cursor.fetchall():
+        if isinstance(column_type, bytes):
+            column_type = column_type.decode()
+        schema.setdefault(table, {})[column] = column_type.lower()
+    return schema
+
+
+def arrow_type(column_type: str) -> pa.DataType:
+    """Тип Arrow для типа столбца MySQL (например, 'decimal(3,1)', "enum('a','b')")"""
+    base = re.match(r'\w+', column_type).group(0)
+    args = [int(arg) for arg in re.findall(r'\d+', column_type.split(')')[0])] if '(' in column_type else []
+    if base in ('tinyint', 'smallint', 'mediumint', 'int', 'bigint'):
+        return INTEGER_TYPES[(base, 'unsigned' in column_type)]
+    if base == 'year':
+        return pa.int16()
+    if base == 'decimal':
+        precision = args[0] if args else 10
+        scale = args[1] if len(args) > 1 else 0
+        return pa.decimal128(precision, scale)
+    if base in ('float', 'double'):
+        return pa.float64()
+    if base == 'date':
+        return pa.date32()
+    if base in ('datetime', 'timestamp'):
+        return pa.timestamp('us' if args and args[0] > 0 else 's')
+    if base == 'time':
+        return pa.time32('s')
+    if base == 'enum':
+        return pa.dictionary(pa.int8(), pa.string())
+    return pa.string()
+
+
+def arrow_schema(headers: list[str], column_types: dict[str, str]) -> pa.Schema:
+    """Схема Arrow для столбцов headers; неизвестные столбцы — строки"""
+    return pa.schema([
+        pa.field(column, arrow_type(column_types[column]) if column in column_types else pa.string())
+        for column in headers
+    ])
+
+
+def _convert_value(value, data_type: pa.DataType):
+    """Приводит значение из CSV-строки, курсора MySQL или генератора к типу data_type"""
+    if value is None or (value == '' and not pa.types.is_string(data_type)):
+        return None
+    if isinstance(value, np.generic):
+        value = value.item()
+    if pa.types.is_integer(data_type):
+        return int(value)
+    if pa.types.is_floating(data_type):
+        return float(value)
+    if pa.types.is_decimal(data_type):
+        return Decimal(str(value)).quantize(Decimal(1).scaleb(-data_type.scale))
+    if pa.types.is_date(data_type):
+        if isinstance(value, datetime):
+            return value.date()
+        return value if isinstance(value, date) else date.fromisoformat(str(value)[:10])
+    if pa.types.is_timestamp(data_type):
+        if isinstance(value, datetime):
+            return value
+        if isinstance(value, date):
+            return datetime.combine(value, time())
+        return datetime.fromisoformat(str(value))
+    if pa.types.is_time(data_type):
+        if isinstance(value, timedelta):
+            # mysql-connector возвращает TIME как timedelta
+            return (datetime.min + value).time()
+        return value if isinstance(value, time) else time.fromisoformat(str(value))
+    return str(value)
+
+
+def to_arrow_array(values, data_type: pa.DataType) -> pa.Array:
+    """Столбец (список или массив NumPy) в массив Arrow типа data_type"""
+    if isinstance(values, np.ndarray) and values.dtype != object:
+        if pa.types.is_dictionary(data_type):
+            return pa.array(values.astype(str)).dictionary_encode().cast(data_type)
+        if not (pa.types.is_decimal(data_type) or pa.types.is_time(data_type)):
+            return pa.array(values).cast(data_type)
+        values = values.tolist()
+    elif isinstance(values, np.ndarray):
+        values = values.tolist()
+
+    if pa.types.is_dictionary(data_type):
+        strings = pa.array([_convert_value(value, pa.string()) for value in values], type=pa.string())
+        return strings.dictionary_encode().cast(data_type)
+    return pa.array([_convert_value(value, data_type) for value in values], type=data_type)
+
+
+class ParquetTableWriter:
+    """
+    Потоковая запись таблицы в Parquet: пачки строк или столбцов копятся до
+    row_group_size строк и сбрасываются отдельной группой строк
+    """
+
+    def __init__(self, path, schema: pa.Schema, compression: str = 'zstd',
+                 row_group_size: int = ROW_GROUP_SIZE):
+        self.path = Path(path)
+        self.schema = schema
+        self.row_group_size = row_group_size
+        self.writer = pq.ParquetWriter(
+            str(self.path), schema,
+            compression=None if compression == 'none' else compression
+        )
+        self.pending = []
+        self.pending_rows = 0
+        self.total = 0
+
+    def write_rows(self, rows):
+        """Пачка строк (кортежей или списков) в порядке столбцов схемы"""
+        rows = list(rows)
+        if rows:
+            self.write_columns(list(zip(*rows)))
+
+    def write_columns(self, columns):
+        """Пачка столбцов (списков или массивов NumPy) в порядке столбцов схемы"""
+        arrays = [to_arrow_array(column, field.type) for column, field in zip(columns, self.schema)]
+        batch = pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+        self.pending.append(batch)
+        self.pending_rows += batch.num_rows
+        self.total += batch.num_rows
+        if self.pending_rows >= self.row_group_size:
+            self._flush(full_groups_only=True)
+
+    def _flush(self, full_groups_only: bool = False):
+        """Сбрасывает накопленные строки; при full_groups_only остаток меньше группы ждет следующих пачек"""
+        if not self.pending:
+            return
+        table = pa.Table.from_batches(self.pending, schema=self.schema)
+        size = table.num_rows - table.num_rows % self.row_group_size if full_groups_only else table.num_rows
+        if size:
+            self.writer.write_table(table.slice(0, size), row_group_size=self.row_group_size)
+        rest = table.slice(size)
+        self.pending, self.pending_rows = rest.to_batches(), rest.num_rows
+
+    def close(self):
+        self._flush()
+        self.writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,92 @@
+"""
+Взвешенный выбор категориальных значений методом алиасов (Walker, вариант Vose).
+
+Таблица алиасов строится один раз при объявлении распределения; после этого одно значение
+выбирается за O(1) по одному случайному числу (random.choices пересчитывает накопленные веса
+при каждом вызове), а пачка из миллионов значений — несколькими векторными операциями NumPy.
+
+Распределения столбцов схемы объявлены здесь и используются всеми скриптами генерации.
+Скрипты со своими названиями значений (например, англоязычные статусы в add_data_csv.py)
+берут то же распределение через relabel().
+"""
+
+import random
+from collections.abc import Sequence
+
+import numpy as np
+
+
+class AliasSampler:
+    """Дискретное распределение values с весами weights и таблицей алиасов для выборки за O(1)"""
+
+    def __init__(self, values: Sequence, weights: Sequence[float]):
+        weights = np.asarray(weights, dtype=np.float64)
+        if len(values) != len(weights) or not len(weights):
+            raise ValueError("Число значений и весов должно совпадать и быть больше нуля")
+        if (weights < 0).any() or weights.sum() <= 0:
+            raise ValueError("Веса должны быть неотрицательными с положительной суммой")
+        self.values = list(values)
+        self.weights = weights / weights.sum()
+
+        # Каждая ячейка i хранит свое значение с вероятностью accept[i] и алиас alias[i] в остальных случаях
+        size = len(weights)
+        scaled = self.weights * size
+        accept = np.ones(size)
+        alias = np.arange(size)
+        small = [i for i in range(size) if scaled[i] < 1]
+        large = [i for i in range(size) if scaled[i] >= 1]
+        while small and large:
+            low, high = small.pop(), large.pop()
+            accept[low], alias[low] = scaled[low], high
+            scaled[high] -= 1 - scaled[low]
+            (small if scaled[high] < 1 else large).append(high)
+
+        self.accept = accept
+        self.alias = alias
+        self._accept = accept.tolist()
+        self._alias = alias.tolist()
+        self._array = np.array(self.values, dtype=object)
+
+    def __len__(self):
+        return len(self.values)
+
+    def sample_code(self, rnd: random.Random = random) -> int:
+        """Номер значения; целая часть u * n — ячейка, дробная — выбор между ячейкой и алиасом"""
+        u = rnd.random() * len(self._accept)
+        cell = int(u)
+        return cell if u - cell < self._accept[cell] else self._alias[cell]
+
+    def sample(self, rnd: random.Random = random):
+        """Одно значение (по умолчанию из глобального генератора random, засеянного скриптом)"""
+        return self.values[self.sample_code(rnd)]
+
+    def sample_codes(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        """Массив size номеров значений"""
+        u = rng.random(size) * len(self.accept)
+        cells = u.astype(np.int64)
+        return np.where(u - cells < self.accept[cells], cells, self.alias[cells])
+
+    def sample_many(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        """Массив size значений (dtype=object)"""
+        return self.take(self.sample_codes(rng, size))
+
+    def take(self, codes: np.ndarray) -> np.ndarray:
+        """Значения по массиву номеров (dtype=object)"""
+        return self._array[codes]
+
+    def relabel(self, values: Sequence) -> 'AliasSampler':
+        """То же распределение с другими названиями значений (в том же порядке)"""
+        return AliasSampler(values, self.weights)
+
+
+# Attendance.status
+ATTENDANCE_STATUS = AliasSampler(
+    ['присутствовал', 'отсутствовал', 'уважительная_причина', 'опоздал'],
+    [0.75, 0.15, 0.05, 0.05]
+)
+
+# Students.status
+STUDENT_STATUS = AliasSampler(
+    ['обучается', 'отчислен', 'академический_отпуск'],
+    [0.85, 0.1, 0.05]
+)
@@ -0,0 +1,109 @@
+"""
+Распределение занятий по аудиториям и времени без конфликтов.
+
+Занятость хранится битовыми масками 15-минутных интервалов: для каждого дня — массив масок
+аудиторий, для каждой пары (день, преподаватель) — одна маска. Занятие ставится только туда,
+где все его интервалы свободны, поэтому пары (classroom, class_time) уникальны
+(UNIQUE idx_unique_class), занятия в одной аудитории не пересекаются, а преподаватель
+не ведет два занятия одновременно. Расписание загружается в MySQL с первого раза.
+
+Варианты времени курса (день x слот) перебираются в псевдослучайном порядке без повторов
+(FeistelPermutation), поэтому каждый вариант проверяется для курса не более одного раза,
+а порядок перебора зависит только от seed и ключа курса.
+"""
+
+import random
+from collections.abc import Sequence
+from datetime import date, datetime, time, timedelta
+
+import numpy as np
+
+from unique_keys import CombinationSpace, FeistelPermutation
+
+# Длина интервала занятости в минутах и число интервалов в маске одного дня
+QUANTUM_MINUTES = 15
+MASK_BITS = 64
+
+
+def classroom_names(buildings: int, rooms: range) -> list[str]:
+    """Названия аудиторий вида 'Корпус-N ауд-M'"""
+    return [f"Корпус-{building} ауд-{room}" for building in range(1, buildings + 1) for room in rooms]
+
+
+def days_between(start: date, end: date, weekdays_only: bool = False) -> list[date]:
+    """Дни отрезка [start, end]; при weekdays_only — только понедельник-пятница"""
+    days = [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+    return [day for day in days if day.weekday() < 5] if weekdays_only else days
+
+
+class SlotAllocator:
+    """Назначение занятиям свободных аудиторий и времени с учетом занятости преподавателей"""
+
+    def __init__(self, rooms: Sequence[str], seed: int, day_start: time = time(8, 0)):
+        if not rooms:
+            raise ValueError("Список аудиторий пуст")
+        self.rooms = list(rooms)
+        self.seed = seed
+        self.day_start = day_start.hour * 60 + day_start.minute
+        self.rng = random.Random(seed)
+        # день -> маски занятости аудиторий (uint64, бит i — интервал i от day_start)
+        self.room_busy = {}
+        # (день, преподаватель) -> маска занятости
+        self.teacher_busy = {}
+
+    def _mask(self, start: time, duration: int) -> int:
+        """Маска интервалов, которые занимает занятие длительностью duration минут"""
+        offset = start.hour * 60 + start.minute - self.day_start
+        first = offset // QUANTUM_MINUTES
+        last = -(-(offset + duration) // QUANTUM_MINUTES)
+        if first < 0 or last > MASK_BITS:
+            raise ValueError(f"Занятие {start} ({duration} мин) выходит за пределы учебного дня")
+        return ((1 << (last - first)) - 1) << first
+
+    def _free_room(self, day: date, mask: int) -> int | None:
+        """Случайная аудитория, свободная в интервалах mask, или None"""
+        busy = self.room_busy.get(day)
+        if busy is None:
+            busy = self.room_busy[day] = np.zeros(len(self.rooms), dtype=np.uint64)
+        mask = np.uint64(mask)
+        # Обычно случайная аудитория свободна; иначе выбираем среди всех свободных
+        room = self.rng.randrange(len(self.rooms))
+        if not busy[room] & mask:
+            return room
+        free = np.flatnonzero((busy & mask) == 0)
+        return int(free[self.rng.randrange(len(free))]) if len(free) else None
+
+    def schedule(self, key: int, days: Sequence[date], slots: Sequence[tuple[time, int]],
+                 count: int, teacher=None) -> list[tuple[str, datetime, int]]:
+        """
+        Ставит count занятий курса: каждое получает день из days, слот (время начала,
+        длительность в минутах) из slots и свободную аудиторию. Если передан teacher,
+        занятия не пересекаются с другими занятиями этого преподавателя.
+        Возвращает [(аудитория, начало, длительность)] в порядке времени; если свободных
+        вариантов меньше count, возвращается столько занятий, сколько удалось поставить
+        """
+        result = []
+        if not count or not days or not slots:
+            return result
+        space = CombinationSpace(len(days), len(slots))
+        masks = [self._mask(start, duration) for start, duration in slots]
+        order = FeistelPermutation(space.size, self.seed * 1000003 + key)
+
+        for index in range(space.size):
+            day_pos, slot_pos = space.decode(order(index))
+            day, mask = days[day_pos], masks[slot_pos]
+            teacher_key = (day, teacher)
+            if teacher is not None and self.teacher_busy.get(teacher_key, 0) & mask:
+                continue
+            room = self._free_room(day, mask)
+            if room is None:
+                continue
+            self.room_busy[day][room] |= np.uint64(mask)
+            if teacher is not None:
+                self.teacher_busy[teacher_key] = self.teacher_busy.get(teacher_key, 0) | mask
+            start, duration = slots[slot_pos]
+            result.append((self.rooms[room], datetime.combine(day, start), duration))
+            if len(result) == count:
+                break
+        result.sort(key=lambda item: item[1])
+        return result
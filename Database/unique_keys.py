@@ -0,0 +1,138 @@
+"""
+Генерация уникальных значений (коды для email, номера телефонов, сочетания вида
+(зачисление, тип экзамена)) без циклов повтора и без множеств уже использованных значений.
+
+Значение получается из порядкового номера, пропущенного через биективную перестановку
+(сеть Фейстеля), поэтому разные номера всегда дают разные значения, а сами значения
+выглядят случайными. Значение зависит только от seed и номера, что позволяет
+генерировать их независимо в разных процессах.
+"""
+
+import math
+import random
+
+import numpy as np
+
+
+class FeistelPermutation:
+    """Псевдослучайная биекция [0, size) -> [0, size): сеть Фейстеля с cycle-walking"""
+
+    def __init__(self, size: int, seed: int, rounds: int = 4):
+        if size < 1:
+            raise ValueError("Размер перестановки должен быть положительным")
+        self.size = size
+        bits = max(2, (size - 1).bit_length())
+        self.half_bits = (bits + 1) // 2
+        self.mask = (1 << self.half_bits) - 1
+        rng = random.Random(seed)
+        self.keys = [rng.getrandbits(64) for _ in range(rounds)]
+
+    def _round(self, value: int, key: int) -> int:
+        mixed = ((value ^ key) * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+        return (mixed ^ (mixed >> 29)) & self.mask
+
+    def _encrypt(self, value: int) -> int:
+        left, right = value >> self.half_bits, value & self.mask
+        for key in self.keys:
+            left, right = right, left ^ self._round(right, key)
+        return (left << self.half_bits) | right
+
+    def __call__(self, index: int) -> int:
+        if not 0 <= index < self.size:
+            raise IndexError(f"Номер {index} вне диапазона [0, {self.size})")
+        # Домен сети — степень двойки не меньше size; значения за пределами size
+        # прогоняются повторно (в среднем не более 4 итераций)
+        value = self._encrypt(index)
+        while value >= self.size:
+            value = self._encrypt(value)
+        return value
+
+
+class UniqueNumbers:
+    """Уникальные числа из фиксированного диапазона [0, size) в псевдослучайном порядке"""
+
+    def __init__(self, size: int, seed: int):
+        self.permutation = FeistelPermutation(size, seed)
+        self.counter = 0
+
+    def value(self, index: int) -> int:
+        """Число для порядкового номера index"""
+        return self.permutation(index)
+
+    def next(self) -> int:
+        """Следующее неиспользованное число"""
+        value = self.value(self.counter)
+        self.counter += 1
+        return value
+
+
+class UniqueCodes:
+    """
+    Уникальные числовые коды растущей разрядности: сначала все min_digits-значные коды
+    в псевдослучайном порядке, затем (min_digits + 1)-значные и т.д. Коды разной длины
+    не совпадают, поэтому запас кодов не ограничен
+    """
+
+    def __init__(self, seed: int, min_digits: int = 4):
+        self.seed = seed
+        self.min_digits = min_digits
+        self.permutations = {}
+        self.counter = 0
+
+    def value(self, index: int) -> int:
+        """Код для порядкового номера index"""
+        digits = self.min_digits
+        low = 10 ** (digits - 1)
+        while index >= 9 * low:
+            index -= 9 * low
+            digits += 1
+            low *= 10
+        if digits not in self.permutations:
+            self.permutations[digits] = FeistelPermutation(9 * low, self.seed + digits)
+        return low + self.permutations[digits](index)
+
+    def next(self) -> int:
+        """Следующий неиспользованный код"""
+        value = self.value(self.counter)
+        self.counter += 1
+        return value
+
+
+class CombinationSpace:
+    """
+    Сочетания индексов из range(sizes[0]) x range(sizes[1]) x ..., закодированные одним целым
+    ключом (смешанная система счисления, последний индекс — младший разряд). Выборка ключей
+    без возвращения сразу дает различные сочетания: без повторных попыток и строковых ключей
+    """
+
+    def __init__(self, *sizes: int):
+        if not sizes or min(sizes) < 1:
+            raise ValueError("Размеры измерений должны быть положительными")
+        self.sizes = sizes
+        self.size = math.prod(sizes)
+
+    def encode(self, *indices):
+        """Ключ сочетания; индексы — числа или массивы NumPy одинаковой длины"""
+        key = 0
+        for index, size in zip(indices, self.sizes):
+            key = key * size + index
+        return key
+
+    def decode(self, key) -> tuple:
+        """Индексы сочетания по ключу (числу или массиву NumPy)"""
+        indices = []
+        for size in reversed(self.sizes):
+            key, index = divmod(key, size)
+            indices.append(index)
+        return tuple(reversed(indices))
+
+    def sample(self, rng: np.random.Generator, count: int, exclude=None) -> np.ndarray:
+        """
+        count различных ключей в случайном порядке, не входящих в exclude. Если свободных
+        ключей меньше count, возвращаются все свободные ключи
+        """
+        excluded = np.unique(np.asarray(exclude if exclude is not None else [], dtype=np.int64))
+        free = self.size - len(excluded)
+        ranks = rng.choice(free, size=min(count, free), replace=False)
+        # Ранг среди свободных ключей -> ключ: сдвиг на число занятых ключей, не превышающих результат
+        return ranks + np.searchsorted(excluded - np.arange(len(excluded)), ranks, side='right')
@@ -0,0 +1,218 @@
+"""
+HTTP-сервис оценки риска отчисления для отдельных студентов.
+
+Модель загружается один раз при запуске. Признаки всех студентов берутся из того же
+источника, что и в ml_dropout_risk.py (выгрузки, MySQL или хранилище признаков), и вместе
+с оценками риска, посчитанными одной векторной пачкой, хранятся в памяти. Кэш обновляется в фоне каждые
+--refresh-seconds секунд, поэтому запрос — это поиск по student_id без вызова модели.
+
+Запросы:
+~ GET  /score?student_id=42                 оценка одного студента
+~ POST /score  {"student_ids": [1, 2, 3]}   оценки пачки студентов
+~ GET  /health                              версия модели и состояние кэша
+
+Пример запуска:
+~ python dropout_risk_service.py --model models --data-dir edu_data --http-port 8080
+~ python dropout_risk_service.py --model models --source store --refresh-seconds 300
+"""
+
+import argparse
+import json
+import logging
+import sys
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from ml_dropout_risk import (
+    FEATURES, feature_matrix, features_from_sums, load_artifact, load_sums, score_batches,
+    source_arguments, SCORE_BATCH_SIZE
+)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+logger = logging.getLogger(__name__)
+
+# Максимум студентов в одном пакетном запросе
+MAX_BATCH = 10000
+
+# Допустимый диапазон student_id (ключи снимка хранятся в int64)
+ID_MIN, ID_MAX = np.iinfo(np.int64).min, np.iinfo(np.int64).max
+
+
+def parse_student_id(value) -> int:
+    """Целый student_id из запроса; ValueError, если значение не целое или вне диапазона int64"""
+    student_id = int(value)
+    if not ID_MIN <= student_id <= ID_MAX:
+        raise ValueError(f"student_id {student_id} вне диапазона int64")
+    return student_id
+
+
+class ScoreCache:
+    """Признаки и оценки риска всех студентов; обновление подменяет снимок целиком"""
+
+    def __init__(self, artifact, args):
+        self.artifact = artifact
+        self.args = args
+        self.snapshot = None
+
+    def refresh(self):
+        """Пересчитывает признаки и оценки из источника и атомарно подменяет снимок"""
+        start = time.perf_counter()
+        df = features_from_sums(load_sums(self.args))
+        X = feature_matrix(df, self.artifact['fill_values'])
+        student_ids = df['student_id'].to_numpy(dtype=np.int64)
+        order = np.argsort(student_ids)
+        snapshot = {
+            'student_ids': student_ids[order],
+            'statuses': df['status'].to_numpy(dtype=object)[order],
+            'features': X[order],
+            'scores': score_batches(self.artifact['estimator'], X, self.args.batch_size)[order],
+            'refreshed_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        # Одно присваивание ссылки: обработчики видят либо старый, либо новый снимок
+        self.snapshot = snapshot
+        logger.info(f"Кэш обновлен: {len(student_ids)} студентов за {time.perf_counter() - start:.2f} сек")
+
+    def refresh_forever(self, interval: float):
+        while True:
+            time.sleep(interval)
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Ошибка обновления кэша, используется прежний снимок: {e}")
+
+    def lookup(self, student_ids) -> list[dict]:
+        """Оценки студентов в порядке запроса; для неизвестных студентов risk_score = null"""
+        snapshot = self.snapshot
+        ids = np.asarray(student_ids, dtype=np.int64)
+        if not len(snapshot['student_ids']):
+            return [{'student_id': student_id, 'risk_score': None} for student_id in ids.tolist()]
+        positions = np.minimum(np.searchsorted(snapshot['student_ids'], ids), len(snapshot['student_ids']) - 1)
+        found = snapshot['student_ids'][positions] == ids
+
+        scores = np.round(snapshot['scores'][positions], 4).tolist()
+        statuses = snapshot['statuses'][positions].tolist()
+        features = snapshot['features'][positions].tolist()
+
+        results = []
+        for student_id, ok, score, status, values in zip(ids.tolist(), found.tolist(), scores, statuses, features):
+            if not ok:
+                results.append({'student_id': student_id, 'risk_score': None})
+                continue
+            results.append({
+                'student_id': student_id,
+                'risk_score': score,
+                'status': status,
+                'features': dict(zip(FEATURES, values)),
+            })
+        return results
+
+    def health(self) -> dict:
+        snapshot = self.snapshot
+        student_ids = snapshot['student_ids']
+        return {
+            'model_version': self.artifact['version'],
+            'students': int(len(student_ids)),
+            'student_id_range': [int(student_ids[0]), int(student_ids[-1])] if len(student_ids) else None,
+            'refreshed_at': snapshot['refreshed_at'],
+        }
+
+
+class ScoreHandler(BaseHTTPRequestHandler):
+    # Keep-alive: клиент может отправлять запросы по одному соединению
+    protocol_version = 'HTTP/1.1'
+    # Без алгоритма Нейгла: заголовки и тело ответа не ждут задержанного ACK клиента (~40 мс)
+    disable_nagle_algorithm = True
+    cache: ScoreCache = None
+
+    def _send(self, status: int, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == '/health':
+            self._send(200, self.cache.health())
+        elif url.path == '/score':
+            try:
+                student_id = parse_student_id(parse_qs(url.query)['student_id'][0])
+            except (KeyError, ValueError, OverflowError):
+                self._send(400, {'error': 'нужен целый параметр student_id'})
+                return
+            result = self.cache.lookup([student_id])[0]
+            self._send(200 if result['risk_score'] is not None else 404, result)
+        else:
+            self._send(404, {'error': 'неизвестный путь'})
+
+    def do_POST(self):
+        if urlparse(self.path).path != '/score':
+            self._send(404, {'error': 'неизвестный путь'})
+            return
+        try:
+            payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+            student_ids = [parse_student_id(student_id) for student_id in payload['student_ids']]
+        except (KeyError, TypeError, ValueError, OverflowError):
+            self._send(400, {'error': 'нужен JSON {"student_ids": [...]}'})
+            return
+        if len(student_ids) > MAX_BATCH:
+            self._send(413, {'error': f'не более {MAX_BATCH} студентов в запросе'})
+            return
+        self._send(200, {'model_version': self.cache.artifact['version'],
+                         'results': self.cache.lookup(student_ids)})
+
+    def log_message(self, format, *args):
+        # Журнал каждого запроса заметно замедляет ответы под нагрузкой
+        pass
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='HTTP-сервис оценки риска отчисления',
+                                     parents=[source_arguments()])
+    parser.add_argument('--model', default='models',
+                        help='Файл модели .joblib или каталог моделей (берется последняя версия)')
+    parser.add_argument('--bind', default='127.0.0.1', help='Адрес HTTP-сервера')
+    parser.add_argument('--http-port', type=int, default=8080, help='Порт HTTP-сервера')
+    parser.add_argument('--refresh-seconds', type=float, default=900,
+                        help='Период обновления кэша признаков и оценок (0 — без обновления)')
+    parser.add_argument('--batch-size', type=int, default=SCORE_BATCH_SIZE,
+                        help='Строк в пачке при пересчете оценок')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    artifact = load_artifact(args.model)
+    artifact['estimator'].n_jobs = -1
+    logger.info(f"Загружена модель версии {artifact['version']}")
+
+    cache = ScoreCache(artifact, args)
+    cache.refresh()
+    if args.refresh_seconds > 0:
+        threading.Thread(target=cache.refresh_forever, args=(args.refresh_seconds,), daemon=True).start()
+
+    ScoreHandler.cache = cache
+    server = ThreadingHTTPServer((args.bind, args.http_port), ScoreHandler)
+    server.daemon_threads = True
+    logger.info(f"Сервис слушает http://{args.bind}:{args.http_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Нагрузочный тест сервиса dropout_risk_service.py: задержка (p50/p99) и пропускная способность.
+
+Каждый поток держит одно keep-alive соединение и отправляет запросы подряд: одиночные
+GET /score?student_id=... или пакетные POST /score (при --batch > 1). ID студентов берутся
+случайно из диапазона, который сообщает /health.
+
+Пример запуска:
+~ python load_test_dropout_risk.py --url http://127.0.0.1:8080 --requests 20000 --concurrency 8
+~ python load_test_dropout_risk.py --batch 500 --requests 2000
+"""
+
+import argparse
+import http.client
+import json
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+import numpy as np
+
+
+def worker(url, student_range, requests, batch, seed, latencies, errors):
+    """Отправляет requests запросов по одному соединению и записывает задержки в секундах"""
+    rng = random.Random(seed)
+    connection = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=30)
+    low, high = student_range
+    for _ in range(requests):
+        if batch == 1:
+            method, path, body = 'GET', f'/score?student_id={rng.randint(low, high)}', None
+        else:
+            ids = [rng.randint(low, high) for _ in range(batch)]
+            method, path, body = 'POST', '/score', json.dumps({'student_ids': ids})
+        start = time.perf_counter()
+        try:
+            connection.request(method, path, body=body, headers={'Content-Type': 'application/json'})
+            response = connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException) as e:
+            # Соединение разорвано: запрос считается ошибкой, следующий откроет новое соединение
+            errors.append(type(e).__name__)
+            connection.close()
+            continue
+        latencies.append(time.perf_counter() - start)
+        # 404 — неизвестный студент (пропуск в ID), не ошибка сервиса
+        if response.status not in (200, 404):
+            errors.append(response.status)
+    connection.close()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Нагрузочный тест сервиса оценки риска отчисления')
+    parser.add_argument('--url', default='http://127.0.0.1:8080', help='Адрес сервиса')
+    parser.add_argument('--requests', type=int, default=10000, help='Всего запросов')
+    parser.add_argument('--concurrency', type=int, default=8, help='Число параллельных соединений')
+    parser.add_argument('--batch', type=int, default=1, help='Студентов в запросе (1 — одиночные GET)')
+    parser.add_argument('--warmup', type=int, default=100, help='Запросов прогрева (не учитываются)')
+    parser.add_argument('--seed', type=int, default=42, help='Seed выбора студентов')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    url = urlparse(args.url)
+
+    connection = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=30)
+    connection.request('GET', '/health')
+    health = json.loads(connection.getresponse().read())
+    connection.close()
+    if not health['student_id_range']:
+        raise SystemExit('В кэше сервиса нет студентов')
+    print(f"Модель {health['model_version']}, студентов в кэше: {health['students']}")
+
+    worker(url, health['student_id_range'], args.warmup, args.batch, args.seed - 1, [], [])
+
+    latencies, errors = [], []
+    per_thread = [args.requests // args.concurrency + (i < args.requests % args.concurrency)
+                  for i in range(args.concurrency)]
+    threads = [
+        threading.Thread(target=worker, args=(url, health['student_id_range'], count, args.batch,
+                                              args.seed + i, latencies, errors))
+        for i, count in enumerate(per_thread)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    if not latencies:
+        raise SystemExit(f'Ни один запрос не выполнен, ошибок: {len(errors)}')
+    latencies_ms = np.array(latencies) * 1000
+    print(f"Запросов: {len(latencies)} ({args.batch} студентов в запросе), потоков: {args.concurrency}, "
+          f"ошибок: {len(errors)}")
+    print(f"Задержка, мс: p50 {np.percentile(latencies_ms, 50):.2f}, p99 {np.percentile(latencies_ms, 99):.2f}, "
+          f"max {latencies_ms.max():.2f}")
+    print(f"Пропускная способность: {len(latencies) / elapsed:.0f} запросов/сек, "
+          f"{len(latencies) * args.batch / elapsed:.0f} студентов/сек")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,42 +1,725 @@
+"""
+Модель риска отчисления студентов.
 
+Обучение сохраняет версию модели вместе со схемой признаков, скоринг загружает ее
+и оценивает всех обучающихся студентов без переобучения:
+~ python ml_dropout_risk.py train --data-dir edu_data
+~ python ml_dropout_risk.py score --source mysql --password ... --to-db
+~ python ml_dropout_risk.py score --data-dir edu_data --output risk_scores.parquet
+
+Хранилище признаков (SQLite) накапливает суммы по студентам: ежедневное update-store читает
+только строки Grades и Attendance новее водяных знаков, а модель, сервис скоринга и дашборды
+(представление student_features) читают признаки из хранилища:
+~ python ml_dropout_risk.py update-store --source mysql --password ...
+~ python ml_dropout_risk.py score --source store --output risk_scores.parquet
+"""
+
+import os
+import glob
+import itertools
+import json
+import sqlite3
+import argparse
+from datetime import datetime
 import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import classification_report, roc_auc_score
-import matplotlib.pyplot as plt
-
-# Загрузка данных
-students = pd.read_csv('Students.csv')
-grades = pd.read_csv('Grades.csv')
-attendance = pd.read_csv('Attendance.csv')
-
-# Признак: средний балл студента
-grades_agg = grades.groupby('student_id')['grade'].mean().reset_index().rename(columns={'grade': 'avg_grade'})
-# Признак: доля двоек и троек
-grades['is_low'] = grades['grade'] <= 3.0
-low_grades = grades.groupby('student_id')['is_low'].mean().reset_index().rename(columns={'is_low': 'low_grade_share'})
-# Признак: средняя посещаемость (доля пропусков)
-attendance['is_absent'] = attendance['status'].isin(['отсутствовал', 'уважительная_причина'])
-attendance_agg = attendance.groupby('student_id')['is_absent'].mean().reset_index().rename(columns={'is_absent': 'absent_share'})
-# Объединяем признаки
-df = students.merge(grades_agg, on='student_id', how='left')              .merge(low_grades, on='student_id', how='left')              .merge(attendance_agg, on='student_id', how='left')
-df['target'] = (df['status'] == 'отчислен').astype(int)
-df['avg_grade'] = df['avg_grade'].fillna(df['avg_grade'].mean())
-df['low_grade_share'] = df['low_grade_share'].fillna(0)
-df['absent_share'] = df['absent_share'].fillna(0)
-features = ['avg_grade', 'low_grade_share', 'absent_share']
-X = df[features]
-y = df['target']
-X_train, X_test, y_train, y_test = train_test_split(X, y, stratify=y, test_size=0.3, random_state=42)
-model = RandomForestClassifier(n_estimators=100, random_state=42, class_weight='balanced')
-model.fit(X_train, y_train)
-y_pred = model.predict(X_test)
-y_proba = model.predict_proba(X_test)[:, 1]
-print(classification_report(y_test, y_pred))
-print('ROC-AUC:', roc_auc_score(y_test, y_proba))
-importances = model.feature_importances_
-plt.barh(features, importances)
-plt.xlabel('Важность признака')
-plt.title('Feature Importances')
-plt.show()
+
+# Строк в одной пачке при потоковом чтении Grades и Attendance
+CHUNK_SIZE = 500000
+
+# Статусы посещаемости, считающиеся пропуском
+ABSENT_STATUSES = ['отсутствовал', 'уважительная_причина']
+
+# Источники признаков: выгрузки (CSV/Parquet), агрегаты, посчитанные в MySQL, или хранилище признаков
+SOURCES = ('files', 'mysql', 'store')
+
+# Модель: имя артефакта, признаки в порядке столбцов матрицы, целевой и оцениваемый статусы
+MODEL_NAME = 'dropout_risk'
+FEATURES = ['avg_grade', 'low_grade_share', 'absent_share']
+DROPPED_STATUS = 'отчислен'
+ACTIVE_STATUS = 'обучается'
+
+# Строк в одной пачке при скоринге и записи оценок в базу
+SCORE_BATCH_SIZE = 100000
+
+# Таблица оценок риска (одна строка на студента, перезаписывается при каждом скоринге)
+RISK_TABLE = 'Dropout_Risk'
+RISK_TABLE_DDL = f"""
+CREATE TABLE IF NOT EXISTS {RISK_TABLE} (
+    student_id INT PRIMARY KEY COMMENT 'Студент (внешний ключ к Students)',
+    risk_score DECIMAL(5,4) NOT NULL COMMENT 'Вероятность отчисления',
+    model_version VARCHAR(32) NOT NULL COMMENT 'Версия модели',
+    scored_at DATETIME NOT NULL COMMENT 'Время скоринга',
+    FOREIGN KEY (student_id) REFERENCES Students(student_id) ON DELETE CASCADE
+) ENGINE=InnoDB
+"""
+
+# Суммы по студенту, из которых считаются признаки
+SUM_COLUMNS = ['grade_rows', 'graded', 'grade_tenths', 'low_grades', 'attendance_rows', 'absences']
+
+# Те же суммы, посчитанные в базе: GROUP BY student_id по Grades и Attendance, соединенные со Students.
+# NULL-оценка не входит в graded и не считается двойкой (как в потоковой версии).
+# {where} — фильтр строк (пустой для полного пересчета, диапазон ключей для дельты хранилища)
+GRADE_SUMS_QUERY = """
+SELECT student_id,
+       COUNT(*) AS grade_rows,
+       COUNT(grade) AS graded,
+       CAST(COALESCE(SUM(grade * 10), 0) AS SIGNED) AS grade_tenths,
+       CAST(COALESCE(SUM(grade <= 3.0), 0) AS SIGNED) AS low_grades
+FROM Grades
+{where}
+GROUP BY student_id
+"""
+ATTENDANCE_SUMS_QUERY = """
+SELECT student_id,
+       COUNT(*) AS attendance_rows,
+       CAST(SUM(status IN ({absent_statuses})) AS SIGNED) AS absences
+FROM Attendance
+{where}
+GROUP BY student_id
+"""
+FEATURE_SUMS_QUERY = """
+SELECT s.student_id, s.status,
+       COALESCE(g.grade_rows, 0), COALESCE(g.graded, 0), COALESCE(g.grade_tenths, 0), COALESCE(g.low_grades, 0),
+       COALESCE(a.attendance_rows, 0), COALESCE(a.absences, 0)
+FROM Students s
+LEFT JOIN ({grades}) g ON g.student_id = s.student_id
+LEFT JOIN ({attendance}) a ON a.student_id = s.student_id
+ORDER BY s.student_id
+"""
+
+# Хранилище признаков (SQLite): суммы по студентам, накопленные по новым строкам Grades и Attendance,
+# статусы студентов и водяные знаки — последний учтенный первичный ключ каждой таблицы.
+# Строки Grades и Attendance только добавляются: исправленные и удаленные строки хранилище
+# не отслеживает, их учитывает полная пересборка (update-store --full)
+STORE_PATH = 'dropout_features.sqlite'
+STORE_KEYS = {'Grades': 'grade_id', 'Attendance': 'attendance_id'}
+GRADE_SUMS = ['grade_rows', 'graded', 'grade_tenths', 'low_grades']
+ATTENDANCE_SUMS = ['attendance_rows', 'absences']
+
+# Каталог дельт инкрементального экспорта и журнал слитых compact_tables дельт (как в export_to_csv.py)
+DELTA_DIR = 'deltas'
+COMPACTED_LOG = 'compacted.log'
+
+STORE_DDL = [
+    "CREATE TABLE IF NOT EXISTS students (student_id INTEGER PRIMARY KEY, status TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS student_sums (student_id INTEGER PRIMARY KEY, "
+    + ', '.join(f'{name} INTEGER NOT NULL DEFAULT 0' for name in SUM_COLUMNS) + ")",
+    "CREATE TABLE IF NOT EXISTS watermarks (table_name TEXT PRIMARY KEY, last_id INTEGER NOT NULL, "
+    "updated_at TEXT NOT NULL)",
+    # Дельты export_to_csv.py, строки которых уже учтены в суммах
+    "CREATE TABLE IF NOT EXISTS consumed_deltas (table_name TEXT NOT NULL, file_name TEXT NOT NULL, "
+    "PRIMARY KEY (table_name, file_name))",
+    # Признаки для дашбордов: те же формулы, что в features_from_sums
+    """
+    CREATE VIEW IF NOT EXISTS student_features AS
+    SELECT s.student_id, s.status,
+           CASE WHEN m.graded > 0 THEN m.grade_tenths / (m.graded * 10.0) END AS avg_grade,
+           CASE WHEN m.grade_rows > 0 THEN CAST(m.low_grades AS REAL) / m.grade_rows END AS low_grade_share,
+           CASE WHEN m.attendance_rows > 0 THEN CAST(m.absences AS REAL) / m.attendance_rows END AS absent_share
+    FROM students s
+    LEFT JOIN student_sums m ON m.student_id = s.student_id
+    """,
+]
+
+STORE_SUMS_QUERY = (
+    "SELECT s.student_id, s.status, "
+    + ', '.join(f'COALESCE(m.{name}, 0)' for name in SUM_COLUMNS)
+    + " FROM students s LEFT JOIN student_sums m ON m.student_id = s.student_id ORDER BY s.student_id"
+)
+
+# Прибавление дельты к накопленным суммам
+STORE_UPSERT = (
+    f"INSERT INTO student_sums (student_id, {', '.join(SUM_COLUMNS)}) "
+    f"VALUES ({', '.join(['?'] * (len(SUM_COLUMNS) + 1))}) "
+    "ON CONFLICT(student_id) DO UPDATE SET "
+    + ', '.join(f'{name} = {name} + excluded.{name}' for name in SUM_COLUMNS)
+)
+
+
+def _decimals_to_float(table):
+    """DECIMAL -> float64: иначе pandas хранит значения как объекты Decimal"""
+    import pyarrow as pa
+    schema = pa.schema([pa.field(f.name, pa.float64()) if pa.types.is_decimal(f.type) else f
+                        for f in table.schema])
+    return table.cast(schema)
+
+
+def read_table(name, columns=None, data_dir='.'):
+    """Читает {name}.parquet (типизированный, быстрее), если он есть, иначе {name}.csv"""
+    path = os.path.join(data_dir, name)
+    if os.path.exists(f'{path}.parquet'):
+        import pyarrow.parquet as pq
+        return _decimals_to_float(pq.read_table(f'{path}.parquet', columns=columns)).to_pandas()
+    return pd.read_csv(f'{path}.csv', usecols=columns)
+
+
+def iter_table_chunks(name, columns, chunk_size=CHUNK_SIZE, data_dir='.'):
+    """Читает столбцы columns из {name}.parquet или {name}.csv пачками по chunk_size строк"""
+    path = os.path.join(data_dir, name)
+    if os.path.exists(f'{path}.parquet'):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(f'{path}.parquet').iter_batches(batch_size=chunk_size, columns=columns):
+            yield _decimals_to_float(pa.Table.from_batches([batch])).to_pandas()
+    else:
+        yield from pd.read_csv(f'{path}.csv', usecols=columns, chunksize=chunk_size)
+
+
+class StudentAccumulator:
+    """
+    Целочисленные суммы по student_id в плотных массивах (позиция — student_id).
+    Пачки добавляются через add, частичные результаты складываются через merge; суммы
+    целые, поэтому результат не зависит от размера и порядка пачек, а память — от числа строк
+    """
+
+    def __init__(self, *names):
+        self.sums = {name: np.zeros(0, dtype=np.int64) for name in names}
+
+    def _grow(self, size):
+        for name, values in self.sums.items():
+            if len(values) < size:
+                self.sums[name] = np.concatenate([values, np.zeros(size - len(values), dtype=np.int64)])
+
+    def add(self, student_ids, **columns):
+        """Прибавляет столбцы пачки; None — число строк студента"""
+        student_ids = np.asarray(student_ids, dtype=np.int64)
+        if not len(student_ids):
+            return
+        size = int(student_ids.max()) + 1
+        self._grow(size)
+        for name, column in columns.items():
+            counts = np.bincount(student_ids, weights=column, minlength=size)
+            self.sums[name][:size] += np.rint(counts).astype(np.int64)
+
+    def merge(self, other):
+        self._grow(max((len(values) for values in other.sums.values()), default=0))
+        for name, values in other.sums.items():
+            self.sums[name][:len(values)] += values
+        return self
+
+    def frame(self, rows):
+        """Суммы студентов, у которых есть строки (столбец rows > 0)"""
+        student_ids = np.flatnonzero(self.sums[rows])
+        return pd.DataFrame({'student_id': student_ids,
+                             **{name: values[student_ids] for name, values in self.sums.items()}})
+
+
+def add_grade_chunk(acc, chunk):
+    """Прибавляет пачку Grades: строки, оценки, оценки в десятых долях, двойки и тройки"""
+    grade = chunk['grade'].to_numpy(dtype=float)
+    graded = ~np.isnan(grade)
+    # DECIMAL(3,1): сумма оценок в десятых долях балла точна при любом разбиении на пачки
+    acc.add(chunk['student_id'].to_numpy(), grade_rows=None, graded=graded,
+            grade_tenths=np.where(graded, np.rint(grade * 10), 0), low_grades=grade <= 3.0)
+
+
+def add_attendance_chunk(acc, chunk):
+    """Прибавляет пачку Attendance: строки и пропуски"""
+    acc.add(chunk['student_id'].to_numpy(), attendance_rows=None,
+            absences=chunk['status'].isin(ABSENT_STATUSES).to_numpy())
+
+
+def grade_sums(chunk_size=CHUNK_SIZE, data_dir='.'):
+    """Суммы по Grades, прочитанному пачками"""
+    acc = StudentAccumulator(*GRADE_SUMS)
+    for chunk in iter_table_chunks('Grades', ['student_id', 'grade'], chunk_size, data_dir):
+        add_grade_chunk(acc, chunk)
+    return acc.frame('grade_rows')
+
+
+def attendance_sums(chunk_size=CHUNK_SIZE, data_dir='.'):
+    """Суммы по Attendance, прочитанному пачками"""
+    acc = StudentAccumulator(*ATTENDANCE_SUMS)
+    for chunk in iter_table_chunks('Attendance', ['student_id', 'status'], chunk_size, data_dir):
+        add_attendance_chunk(acc, chunk)
+    return acc.frame('attendance_rows')
+
+
+def load_sums_files(data_dir='.', chunk_size=CHUNK_SIZE):
+    """Суммы по студентам из выгрузок: Students целиком, Grades и Attendance — потоково"""
+    students = read_table('Students', columns=['student_id', 'status'], data_dir=data_dir)
+    sums = students.merge(grade_sums(chunk_size, data_dir), on='student_id', how='left') \
+                   .merge(attendance_sums(chunk_size, data_dir), on='student_id', how='left')
+    sums[SUM_COLUMNS] = sums[SUM_COLUMNS].fillna(0).astype(np.int64)
+    return sums
+
+
+def load_sums_mysql(db_config):
+    """Суммы по студентам, посчитанные в MySQL: по сети идет одна узкая строка на студента"""
+    import mysql.connector
+    placeholders = ', '.join(['%s'] * len(ABSENT_STATUSES))
+    query = FEATURE_SUMS_QUERY.format(
+        grades=GRADE_SUMS_QUERY.format(where=''),
+        attendance=ATTENDANCE_SUMS_QUERY.format(where='', absent_statuses=placeholders)
+    )
+    connection = mysql.connector.connect(**db_config)
+    try:
+        cursor = connection.cursor()
+        cursor.execute(query, ABSENT_STATUSES)
+        rows = cursor.fetchall()
+        cursor.close()
+    finally:
+        connection.close()
+    sums = pd.DataFrame(rows, columns=['student_id', 'status', *SUM_COLUMNS])
+    sums[SUM_COLUMNS] = sums[SUM_COLUMNS].astype(np.int64)
+    return sums
+
+
+def _iter_parquet_new_rows(path, key, columns, low, chunk_size):
+    """
+    Пачки Parquet-файла из групп строк, максимум ключа в которых больше low: старые группы
+    отсекаются по статистике в метаданных файла и не читаются
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    parquet_file = pq.ParquetFile(path)
+    column = parquet_file.schema_arrow.get_field_index(key)
+    row_groups = []
+    for index in range(parquet_file.metadata.num_row_groups):
+        statistics = parquet_file.metadata.row_group(index).column(column).statistics
+        # Группа без статистики читается: про ее ключи ничего не известно
+        if statistics is None or not statistics.has_min_max or statistics.max > low:
+            row_groups.append(index)
+    if not row_groups:
+        return
+    for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns, row_groups=row_groups):
+        yield _decimals_to_float(pa.Table.from_batches([batch])).to_pandas()
+
+
+def delta_files(name, data_dir='.'):
+    """Имена дельт {name}, ожидающих слияния, и дельт, уже слитых compact_tables в базовую выгрузку"""
+    directory = os.path.join(data_dir, DELTA_DIR, name)
+    pending = sorted(os.path.basename(path) for path in glob.glob(os.path.join(directory, '*.csv')))
+    compacted = []
+    if os.path.exists(os.path.join(directory, COMPACTED_LOG)):
+        with open(os.path.join(directory, COMPACTED_LOG), encoding='utf-8') as log:
+            compacted = [line.strip() for line in log if line.strip()]
+    return pending, compacted
+
+
+def iter_new_rows(name, columns, low, read_base=True, deltas=(), chunk_size=CHUNK_SIZE, data_dir='.'):
+    """
+    Строки выгрузки {name} с первичным ключом больше low (столбцы: ключ и columns) пачками.
+    Базовая выгрузка в Parquet читается только в группах строк, где есть ключи больше low;
+    базовая выгрузка в CSV читается, только если read_base, дальше новые строки берутся из дельт
+    export_to_csv.py deltas (имена файлов в deltas/{name}). Дельты повторяют строки окна
+    перекрытия и измененные строки, поэтому строка с уже выданным ключом пропускается
+    """
+    key = STORE_KEYS[name]
+    columns = [key, *columns]
+    path = os.path.join(data_dir, name)
+    if os.path.exists(f'{path}.parquet'):
+        chunks = _iter_parquet_new_rows(f'{path}.parquet', key, columns, low, chunk_size)
+    elif read_base:
+        chunks = pd.read_csv(f'{path}.csv', usecols=columns, chunksize=chunk_size, encoding='utf-8-sig')
+    else:
+        chunks = []
+    delta_chunks = (
+        chunk
+        for delta in deltas
+        for chunk in pd.read_csv(os.path.join(data_dir, DELTA_DIR, name, delta), usecols=columns,
+                                 chunksize=chunk_size, encoding='utf-8-sig')
+    )
+
+    seen = set()
+    for chunk in itertools.chain(chunks, delta_chunks):
+        chunk = chunk[(chunk[key] > low) & ~chunk[key].isin(seen)].drop_duplicates(key)
+        if len(chunk):
+            seen.update(chunk[key].tolist())
+            yield chunk
+
+
+def _combine_sums(grades, attendance):
+    """Суммы Grades и Attendance в одной таблице (нули для студентов без строк в одной из них)"""
+    sums = grades.merge(attendance, on='student_id', how='outer')
+    sums[SUM_COLUMNS] = sums[SUM_COLUMNS].fillna(0).astype(np.int64)
+    return sums[['student_id', *SUM_COLUMNS]]
+
+
+def delta_sums_files(watermarks, consumed, data_dir='.', chunk_size=CHUNK_SIZE):
+    """
+    Статусы студентов, суммы по новым строкам выгрузок, новые водяные знаки и учтенные дельты.
+    Базовая выгрузка в CSV читается при первом заполнении и тогда, когда compact_tables слил
+    в нее дельты, которых хранилище еще не учло (consumed — учтенные дельты по таблицам);
+    иначе читаются только неучтенные дельты
+    """
+    students = read_table('Students', columns=['student_id', 'status'], data_dir=data_dir)
+    frames, highs, deltas = [], {}, {}
+    for name, columns, names, add_chunk in (('Grades', ['student_id', 'grade'], GRADE_SUMS, add_grade_chunk),
+                                            ('Attendance', ['student_id', 'status'], ATTENDANCE_SUMS,
+                                             add_attendance_chunk)):
+        acc = StudentAccumulator(*names)
+        low = high = watermarks.get(name, 0)
+        counted = consumed.get(name, set())
+        pending, compacted = delta_files(name, data_dir)
+        missed = [delta for delta in compacted if delta not in counted]
+        if low and missed:
+            print(f"{name}: дельты {', '.join(missed)} слиты compact_tables до update-store, "
+                  f"новые строки ищутся во всей базовой выгрузке")
+        new_deltas = [delta for delta in pending if delta not in counted]
+        for chunk in iter_new_rows(name, columns, low, not low or bool(missed), new_deltas, chunk_size, data_dir):
+            add_chunk(acc, chunk)
+            high = max(high, int(chunk[STORE_KEYS[name]].max()))
+        frames.append(acc.frame(names[0]))
+        highs[name] = high
+        # Строки слитых дельт теперь учтены через базовую выгрузку
+        deltas[name] = [*new_deltas, *missed]
+    return students, _combine_sums(*frames), highs, deltas
+
+
+def delta_sums_mysql(watermarks, db_config):
+    """
+    Статусы студентов, суммы по новым строкам Grades и Attendance и новые водяные знаки.
+    Дельта считается в базе по диапазону первичного ключа (low, high], поэтому читаются
+    только новые строки; все запросы видят один согласованный снимок
+    """
+    import mysql.connector
+    placeholders = ', '.join(['%s'] * len(ABSENT_STATUSES))
+    connection = mysql.connector.connect(**db_config)
+    try:
+        cursor = connection.cursor()
+        cursor.execute("SET SESSION TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+        cursor.execute("START TRANSACTION WITH CONSISTENT SNAPSHOT, READ ONLY")
+        cursor.execute("SELECT student_id, status FROM Students")
+        students = pd.DataFrame(cursor.fetchall(), columns=['student_id', 'status'])
+
+        frames, highs = [], {}
+        for name, query, names, params in (('Grades', GRADE_SUMS_QUERY, GRADE_SUMS, ()),
+                                           ('Attendance', ATTENDANCE_SUMS_QUERY, ATTENDANCE_SUMS,
+                                            tuple(ABSENT_STATUSES))):
+            key = STORE_KEYS[name]
+            low = watermarks.get(name, 0)
+            cursor.execute(f"SELECT MAX({key}) FROM {name}")
+            high = cursor.fetchone()[0] or 0
+            if high < low:
+                raise ValueError(f"Максимальный {key} ({high}) меньше водяного знака ({low}): "
+                                 f"таблица {name} пересоздана, нужна пересборка update-store --full")
+            cursor.execute(query.format(where=f"WHERE {key} > %s AND {key} <= %s", absent_statuses=placeholders),
+                           (*params, low, high))
+            frame = pd.DataFrame(cursor.fetchall(), columns=['student_id', *names])
+            frames.append(frame.astype(np.int64))
+            highs[name] = high
+        connection.rollback()
+        cursor.close()
+    finally:
+        connection.close()
+    return students, _combine_sums(*frames), highs
+
+
+def open_store(path):
+    store = sqlite3.connect(path)
+    for ddl in STORE_DDL:
+        store.execute(ddl)
+    return store
+
+
+def update_store(args):
+    """
+    Обновляет хранилище признаков: к суммам прибавляются только строки Grades и Attendance
+    новее водяных знаков, статусы студентов заменяются целиком. С --full хранилище
+    пересобирается по всей истории
+    """
+    store = open_store(args.store)
+    try:
+        watermarks = {} if args.full else dict(store.execute("SELECT table_name, last_id FROM watermarks"))
+        consumed = {}
+        if not args.full:
+            for name, file_name in store.execute("SELECT table_name, file_name FROM consumed_deltas"):
+                consumed.setdefault(name, set()).add(file_name)
+        if args.source == 'mysql':
+            students, sums, highs = delta_sums_mysql(watermarks, db_config(args))
+            deltas = {}
+        else:
+            students, sums, highs, deltas = delta_sums_files(watermarks, consumed, args.data_dir, args.chunk_size)
+        updated_at = datetime.now().isoformat(sep=' ', timespec='seconds')
+
+        # Суммы, статусы и водяные знаки меняются в одной транзакции:
+        # прерванное обновление не учитывает строки дважды и не теряет их
+        with store:
+            if args.full:
+                store.execute("DELETE FROM student_sums")
+                store.execute("DELETE FROM consumed_deltas")
+            store.execute("DELETE FROM students")
+            store.executemany("INSERT INTO students (student_id, status) VALUES (?, ?)",
+                              zip(students['student_id'].tolist(), students['status'].tolist()))
+            store.executemany(STORE_UPSERT, sums.to_numpy().tolist())
+            store.executemany(
+                "INSERT INTO watermarks (table_name, last_id, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(table_name) DO UPDATE SET last_id = excluded.last_id, updated_at = excluded.updated_at",
+                [(name, high, updated_at) for name, high in highs.items()]
+            )
+            store.executemany("INSERT OR IGNORE INTO consumed_deltas (table_name, file_name) VALUES (?, ?)",
+                              [(name, delta) for name, names in deltas.items() for delta in names])
+    finally:
+        store.close()
+
+    print(f"Хранилище {args.store} обновлено: {int(sums['grade_rows'].sum())} новых строк Grades "
+          f"(до {STORE_KEYS['Grades']} {highs['Grades']}), {int(sums['attendance_rows'].sum())} новых строк "
+          f"Attendance (до {STORE_KEYS['Attendance']} {highs['Attendance']}), студентов: {len(students)}")
+
+
+def load_sums_store(path):
+    """Суммы по студентам из хранилища признаков: Grades и Attendance не читаются"""
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Хранилище признаков {path} не найдено: сначала выполните update-store")
+    store = sqlite3.connect(path)
+    try:
+        rows = store.execute(STORE_SUMS_QUERY).fetchall()
+    finally:
+        store.close()
+    sums = pd.DataFrame(rows, columns=['student_id', 'status', *SUM_COLUMNS])
+    sums[SUM_COLUMNS] = sums[SUM_COLUMNS].astype(np.int64)
+    return sums
+
+
+def features_from_sums(sums):
+    """Признаки из сумм (NaN, если у студента нет строк): одинаково для файлов и MySQL"""
+    df = sums[['student_id', 'status']].copy()
+    # Средний балл студента: одно деление точных целых (среднее, округленное до ближайшего float)
+    df['avg_grade'] = (sums['grade_tenths'] / (sums['graded'] * 10)).where(sums['graded'] > 0)
+    # Доля двоек и троек
+    df['low_grade_share'] = (sums['low_grades'] / sums['grade_rows']).where(sums['grade_rows'] > 0)
+    # Средняя посещаемость (доля пропусков)
+    df['absent_share'] = (sums['absences'] / sums['attendance_rows']).where(sums['attendance_rows'] > 0)
+    return df
+
+
+def load_sums(args):
+    """Суммы по студентам из источника --source"""
+    if args.source == 'mysql':
+        return load_sums_mysql(db_config(args))
+    if args.source == 'store':
+        return load_sums_store(args.store)
+    return load_sums_files(args.data_dir, args.chunk_size)
+
+
+def feature_matrix(df, fill_values):
+    """Матрица признаков в порядке FEATURES; пропуски заполняются значениями, сохраненными при обучении"""
+    return df[FEATURES].fillna(fill_values).to_numpy(dtype=np.float64)
+
+
+def save_artifact(model, fill_values, metrics, model_dir):
+    """
+    Сохраняет модель с версией и схемой признаков: {MODEL_NAME}_{версия}.joblib (модель и схема),
+    {MODEL_NAME}_{версия}.json (схема и метрики) и файл LATEST с именем последней версии
+    """
+    import joblib
+    import sklearn
+    os.makedirs(model_dir, exist_ok=True)
+    trained_at = datetime.now()
+    # Версия — время обучения с точностью до секунды; файл создается с O_EXCL, и при совпадении
+    # (два обучения в одну секунду) к версии добавляется суффикс -2, -3, ...
+    suffix = 1
+    while True:
+        version = trained_at.strftime('%Y%m%d-%H%M%S') + (f'-{suffix}' if suffix > 1 else '')
+        path = os.path.join(model_dir, f'{MODEL_NAME}_{version}.joblib')
+        try:
+            artifact_file = open(path, 'xb')
+            break
+        except FileExistsError:
+            suffix += 1
+    meta = {
+        'model': MODEL_NAME,
+        'version': version,
+        'trained_at': trained_at.isoformat(timespec='seconds'),
+        'features': FEATURES,
+        'fill_values': fill_values,
+        'target': f"status == '{DROPPED_STATUS}'",
+        'sklearn_version': sklearn.__version__,
+        'metrics': metrics,
+    }
+    with artifact_file:
+        joblib.dump({**meta, 'estimator': model}, artifact_file)
+    with open(os.path.join(model_dir, f'{MODEL_NAME}_{version}.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    with open(os.path.join(model_dir, 'LATEST'), 'w', encoding='utf-8') as f:
+        f.write(os.path.basename(path))
+    return path
+
+
+def load_artifact(path):
+    """Загружает модель: файл .joblib или каталог моделей (последняя версия из LATEST)"""
+    import joblib
+    if os.path.isdir(path):
+        with open(os.path.join(path, 'LATEST'), encoding='utf-8') as f:
+            path = os.path.join(path, f.read().strip())
+    artifact = joblib.load(path)
+    if artifact['features'] != FEATURES:
+        raise ValueError(f"Схема признаков модели {artifact['features']} не совпадает с {FEATURES}")
+    return artifact
+
+
+def train(args):
+    df = features_from_sums(load_sums(args))
+    y = (df['status'] == DROPPED_STATUS).astype(int).to_numpy()
+    # Значения для пропусков сохраняются в артефакте, чтобы скоринг заполнял их так же
+    fill_values = {'avg_grade': float(df['avg_grade'].mean()), 'low_grade_share': 0.0, 'absent_share': 0.0}
+    X = feature_matrix(df, fill_values)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, stratify=y, test_size=0.3, random_state=42)
+    model = RandomForestClassifier(n_estimators=100, random_state=42, class_weight='balanced')
+    model.fit(X_train, y_train)
+    y_pred = model.predict(X_test)
+    y_proba = model.predict_proba(X_test)[:, 1]
+    print(classification_report(y_test, y_pred))
+    roc_auc = roc_auc_score(y_test, y_proba)
+    print('ROC-AUC:', roc_auc)
+
+    metrics = {
+        'roc_auc': float(roc_auc),
+        'train_rows': int(len(X_train)),
+        'test_rows': int(len(X_test)),
+        'feature_importances': dict(zip(FEATURES, model.feature_importances_.tolist())),
+    }
+    path = save_artifact(model, fill_values, metrics, args.model_dir)
+    print('Модель сохранена:', path)
+
+    if args.plot:
+        import matplotlib.pyplot as plt
+        plt.barh(FEATURES, model.feature_importances_)
+        plt.xlabel('Важность признака')
+        plt.title('Feature Importances')
+        plt.show()
+
+
+def score_batches(model, X, batch_size):
+    """Вероятности отчисления пачками по batch_size строк"""
+    scores = np.empty(len(X), dtype=np.float64)
+    for start in range(0, len(X), batch_size):
+        scores[start:start + batch_size] = model.predict_proba(X[start:start + batch_size])[:, 1]
+    return scores
+
+
+def write_scores(scores, output):
+    """Записывает оценки риска в CSV или Parquet (по расширению файла)"""
+    if output.endswith('.parquet'):
+        scores.to_parquet(output, index=False, compression='zstd')
+    else:
+        scores.to_csv(output, index=False)
+
+
+def upsert_scores(scores, config, batch_size):
+    """Записывает оценки риска в RISK_TABLE многострочными INSERT ... ON DUPLICATE KEY UPDATE"""
+    import mysql.connector
+    query = (
+        f"INSERT INTO {RISK_TABLE} (student_id, risk_score, model_version, scored_at) "
+        "VALUES (%s, %s, %s, %s) "
+        "ON DUPLICATE KEY UPDATE risk_score = VALUES(risk_score), "
+        "model_version = VALUES(model_version), scored_at = VALUES(scored_at)"
+    )
+    rows = list(zip(scores['student_id'].tolist(), scores['risk_score'].tolist(),
+                    scores['model_version'].tolist(),
+                    scores['scored_at'].dt.strftime('%Y-%m-%d %H:%M:%S').tolist()))
+    connection = mysql.connector.connect(**config)
+    try:
+        cursor = connection.cursor()
+        cursor.execute(RISK_TABLE_DDL)
+        for start in range(0, len(rows), batch_size):
+            cursor.executemany(query, rows[start:start + batch_size])
+        connection.commit()
+        cursor.close()
+    except mysql.connector.Error:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+
+
+def score(args):
+    artifact = load_artifact(args.model)
+    model = artifact['estimator']
+    # Предсказание деревьев леса параллельно на всех ядрах
+    model.n_jobs = -1
+
+    df = features_from_sums(load_sums(args))
+    df = df[df['status'] == ACTIVE_STATUS].reset_index(drop=True)
+    X = feature_matrix(df, artifact['fill_values'])
+    scores = pd.DataFrame({
+        'student_id': df['student_id'].to_numpy(),
+        'risk_score': np.round(score_batches(model, X, args.batch_size), 4),
+        'model_version': artifact['version'],
+        'scored_at': datetime.now().replace(microsecond=0),
+    })
+
+    if args.output:
+        write_scores(scores, args.output)
+        print(f'Оценки риска {len(scores)} студентов записаны в {args.output}')
+    if args.to_db:
+        upsert_scores(scores, db_config(args), args.batch_size)
+        print(f'Оценки риска {len(scores)} студентов записаны в таблицу {RISK_TABLE}')
+
+
+def db_config(args):
+    return {
+        'host': args.host,
+        'port': args.port,
+        'user': args.user,
+        'password': args.password,
+        'database': args.db,
+        'charset': 'utf8mb4'
+    }
+
+
+def source_arguments():
+    """Общие аргументы источника признаков (для train, score, update-store и сервиса скоринга)"""
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--source', choices=SOURCES, default='files',
+                        help='files: CSV/Parquet-выгрузки; mysql: агрегаты считаются в базе данных; '
+                             'store: накопленные суммы из хранилища признаков')
+    common.add_argument('--data-dir', default='.', help='Каталог с выгрузками (для --source files)')
+    common.add_argument('--store', default=STORE_PATH, help='Файл SQLite хранилища признаков')
+    common.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                        help='Строк в пачке при чтении Grades и Attendance')
+    common.add_argument('--host', default='localhost', help='Хост базы данных')
+    common.add_argument('--port', type=int, default=3306, help='Порт базы данных')
+    common.add_argument('--user', default=os.getenv('DB_USER'), help='Пользователь базы данных')
+    common.add_argument('--password', default=os.getenv('DB_PASSWORD'), help='Пароль базы данных')
+    common.add_argument('--db', default='educational_institution', help='Название базы данных')
+    return common
+
+
+def parse_args():
+    common = source_arguments()
+
+    parser = argparse.ArgumentParser(description='Модель риска отчисления студентов')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    train_parser = commands.add_parser('train', parents=[common], help='Обучить модель и сохранить ее версию')
+    train_parser.add_argument('--model-dir', default='models', help='Каталог версий модели')
+    train_parser.add_argument('--plot', action='store_true', help='Показать график важности признаков')
+
+    score_parser = commands.add_parser('score', parents=[common], help='Оценить риск отчисления обучающихся студентов')
+    score_parser.add_argument('--model', default='models',
+                              help='Файл модели .joblib или каталог моделей (берется последняя версия)')
+    score_parser.add_argument('--batch-size', type=int, default=SCORE_BATCH_SIZE,
+                              help='Строк в пачке при скоринге и записи в базу')
+    score_parser.add_argument('--output', help='Файл с оценками риска (.csv или .parquet)')
+    score_parser.add_argument('--to-db', action='store_true', help=f'Записать оценки в таблицу {RISK_TABLE}')
+
+    store_parser = commands.add_parser('update-store', parents=[common],
+                                       help='Добавить в хранилище признаков новые строки Grades и Attendance')
+    store_parser.add_argument('--full', action='store_true', help='Пересобрать хранилище по всей истории')
+
+    args = parser.parse_args()
+    if args.command == 'score' and not (args.output or args.to_db):
+        parser.error('для score нужен --output и/или --to-db')
+    if args.command == 'update-store' and args.source == 'store':
+        parser.error('для update-store нужен --source files или mysql')
+    return args
+
+
+def main():
+    args = parse_args()
+    if args.command == 'train':
+        train(args)
+    elif args.command == 'update-store':
+        update_store(args)
+    else:
+        score(args)
+
+
+if __name__ == '__main__':
+    main()
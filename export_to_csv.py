@@ -3,7 +3,16 @@
 ~ pip install mysql-connector-python mysql
 """
 
+import os
 import csv
+import json
+import glob
+import queue
+import itertools
+import shutil
+from datetime import datetime, timedelta
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 import mysql.connector
 from mysql.connector import Error
 
@@ -23,10 +32,453 @@ TABLES = [
     'Assignments', 'AssignmentGrades'
 ]
 
-def export_tables_to_csv():
+# Первичные ключи таблиц (целочисленные AUTO_INCREMENT) для разбиения на диапазоны
+PRIMARY_KEYS = {
+    'Teachers': 'teacher_id', 'Departments': 'department_id', 'Students': 'student_id',
+    'Courses': 'course_id', 'Schedule': 'schedule_id', 'Enrollments': 'enrollment_id',
+    'Grades': 'grade_id', 'Attendance': 'attendance_id', 'Assignments': 'assignment_id',
+    'AssignmentGrades': 'assignment_grade_id'
+}
+
+# Столбцы-водяные знаки для инкрементального экспорта. Таблицы, строки которых меняются
+# (статус студента, исправление оценки или отметки посещаемости, переоценка задания), имеют
+# updated_at с ON UPDATE CURRENT_TIMESTAMP(6): дельта содержит новые и измененные строки.
+# Остальные таблицы только пополняются и выгружают новые строки по AUTO_INCREMENT первичному
+# ключу (бизнес-даты Assignments.created_at и AssignmentGrades.graded_at допускают NULL и
+# заполняются задним числом, поэтому водяными знаками не служат). Строки с NULL в столбце-знаке
+# попадают только в базовый снимок. Удаления инкрементальный экспорт не отслеживает.
+WATERMARK_COLUMNS = {
+    'Departments': 'updated_at',
+    'Students': 'updated_at',
+    'Grades': 'updated_at',
+    'Attendance': 'updated_at',
+    'AssignmentGrades': 'updated_at'
+}
+
+# Окно повторного чтения ниже сохраненного знака. AUTO_INCREMENT и CURRENT_TIMESTAMP выдаются
+# до фиксации транзакции, поэтому строка с меньшим ключом или отметкой может стать видимой
+# позже строки с большим и оказаться ниже знака. Каждая дельта заново читает окно, повторные
+# строки схлопывает compact_table по первичному ключу
+OVERLAP_SECONDS = 600
+OVERLAP_KEYS = 10000
+
+# Файл с водяными знаками и каталог с дельтами инкрементального экспорта
+WATERMARK_FILE = 'export_watermarks.json'
+DELTA_DIR = 'deltas'
+# Журнал слитых дельт (deltas/{table}/compacted.log): по нему потребители дельт, например
+# хранилище признаков ml_dropout_risk.py, узнают о дельтах, слитых до того, как их прочитали
+COMPACTED_LOG = 'compacted.log'
+
+# Размер пачки строк, читаемой из курсора в потоковом режиме
+BATCH_SIZE = 10000
+
+def export_table_stream(cursor, table, batch_size=BATCH_SIZE, where='', params=(),
+                        path=None, encoding='utf-8-sig'):
+    """
+    Потоковый экспорт таблицы: строки читаются небуферизованным курсором пачками
+    fetchmany и сразу пишутся в CSV, поэтому память не зависит от размера таблицы.
+    Названия столбцов берутся из cursor.description (пока результат не дочитан,
+    других запросов на этом соединении выполнять нельзя).
+    where/params ограничивают выгрузку частью таблицы, path задает имя файла.
+    """
+    cursor.execute(f"SELECT * FROM {table} {where}", params)
+    columns = [col[0] for col in cursor.description]
+
+    with open(path or f'{table}.csv', 'w', newline='', encoding=encoding) as csvfile:
+        writer = csv.writer(csvfile, delimiter=',', quoting=csv.QUOTE_MINIMAL)
+        writer.writerow(columns)
+        count = 0
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            writer.writerows(rows)
+            count += len(rows)
+    return count
+
+def export_table_parquet(cursor, table, batch_size=BATCH_SIZE, column_types=None,
+                         compression='zstd', row_group_size=100000, where='', params=(), path=None):
+    """
+    Потоковый экспорт таблицы в {table}.parquet: типы столбцов (DATE, DECIMAL, ENUM
+    и т.д.) берутся из column_types — описания схемы из information_schema.
+    where/params ограничивают выгрузку частью таблицы, path задает имя файла.
+    """
+    from Database.parquet_io import ParquetTableWriter, arrow_schema
+
+    cursor.execute(f"SELECT * FROM {table} {where}", params)
+    columns = [col[0] for col in cursor.description]
+    schema = arrow_schema(columns, (column_types or {}).get(table, {}))
+    with ParquetTableWriter(path or f'{table}.parquet', schema, compression, row_group_size) as writer:
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            writer.write_rows(rows)
+    return writer.total
+
+def parquet_options(connection, compression, row_group_size):
+    """Параметры export_table_parquet: схема базы читается один раз до начала экспорта"""
+    from Database.parquet_io import load_mysql_schema
+
+    cursor = connection.cursor()
+    column_types = load_mysql_schema(cursor, DB_CONFIG['database'])
+    cursor.close()
+    return {'column_types': column_types, 'compression': compression, 'row_group_size': row_group_size}
+
+def export_table(cursor, table, batch_size=BATCH_SIZE, parquet=None):
+    """Потоковый экспорт таблицы в CSV или, если заданы параметры parquet, в Parquet"""
+    if parquet is None:
+        return export_table_stream(cursor, table, batch_size), f'{table}.csv'
+    return export_table_parquet(cursor, table, batch_size, **parquet), f'{table}.parquet'
+
+def open_snapshot_connections(count):
+    """
+    Открывает count соединений, читающих один и тот же согласованный снимок базы.
+    Пока координатор держит глобальную блокировку чтения (FLUSH TABLES WITH READ LOCK,
+    без привилегии RELOAD — LOCK TABLES ... READ на экспортируемые таблицы), каждое
+    соединение начинает транзакцию WITH CONSISTENT SNAPSHOT: ни одна запись не может
+    зафиксироваться между стартами транзакций, поэтому снимки совпадают.
+    """
+    coordinator = mysql.connector.connect(**DB_CONFIG)
+    lock_cursor = coordinator.cursor()
+    connections = []
+    try:
+        try:
+            lock_cursor.execute("FLUSH TABLES WITH READ LOCK")
+        except Error:
+            lock_cursor.execute("LOCK TABLES " + ", ".join(f"{table} READ" for table in TABLES))
+
+        for _ in range(count):
+            connection = mysql.connector.connect(**DB_CONFIG)
+            connections.append(connection)
+            cursor = connection.cursor()
+            cursor.execute("SET SESSION TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+            cursor.execute("START TRANSACTION WITH CONSISTENT SNAPSHOT, READ ONLY")
+            cursor.close()
+    except Error:
+        for connection in connections:
+            connection.close()
+        raise
+    finally:
+        lock_cursor.execute("UNLOCK TABLES")
+        lock_cursor.close()
+        coordinator.close()
+    return connections
+
+def tables_by_size(connection):
+    """Таблицы в порядке убывания оценки числа строк: крупные экспортируются первыми"""
+    cursor = connection.cursor()
+    cursor.execute(
+        "SELECT table_name, table_rows FROM information_schema.tables WHERE table_schema = %s",
+        (DB_CONFIG['database'],)
+    )
+    sizes = {name: rows or 0 for name, rows in cursor.fetchall()}
+    cursor.close()
+    return sorted(TABLES, key=lambda table: sizes.get(table, 0), reverse=True)
+
+def export_tables_parallel(workers=4, batch_size=BATCH_SIZE, output_format='csv',
+                           compression='zstd', row_group_size=100000):
+    """
+    Параллельный потоковый экспорт таблиц через пул соединений с общим снимком.
+    Время экспорта ограничено самой большой таблицей, а не суммой всех.
+    """
+    connections = open_snapshot_connections(min(workers, len(TABLES)))
+    pending = queue.Queue()
+    for table in tables_by_size(connections[0]):
+        pending.put(table)
+    parquet = (parquet_options(connections[0], compression, row_group_size)
+               if output_format == 'parquet' else None)
+
+    def worker(connection):
+        # Каждый поток забирает следующую таблицу и экспортирует ее на своем соединении
+        cursor = connection.cursor(buffered=False)
+        while True:
+            try:
+                table = pending.get_nowait()
+            except queue.Empty:
+                break
+            count, path = export_table(cursor, table, batch_size, parquet)
+            print(f'Таблица {table} экспортирована в {path} ({count} строк)')
+        cursor.close()
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(connections)) as executor:
+            for future in [executor.submit(worker, connection) for connection in connections]:
+                future.result()
+    finally:
+        for connection in connections:
+            if connection.is_connected():
+                connection.rollback()
+                connection.close()
+        print('Соединения с базой данных закрыты')
+
+def key_ranges(connection, table, parts):
+    """
+    Делит диапазон первичного ключа таблицы на parts равных полуинтервалов [low, high).
+    Пропуски в AUTO_INCREMENT лишь немного разбалансируют части.
+    """
+    key = PRIMARY_KEYS[table]
+    cursor = connection.cursor()
+    cursor.execute(f"SELECT MIN({key}), MAX({key}) FROM {table}")
+    low, high = cursor.fetchone()
+    cursor.close()
+    if low is None:
+        return []
+    step = -(-(high - low + 1) // parts)
+    return [(start, min(start + step, high + 1)) for start in range(low, high + 1, step)]
+
+def concat_parts(table, part_paths):
+    """
+    Склеивает части в {table}.csv в порядке ключа: заголовок берется из первой части,
+    у остальных пропускается. Части удаляются после склейки.
+    """
+    with open(f'{table}.csv', 'wb') as output:
+        output.write('\ufeff'.encode('utf-8'))
+        for i, path in enumerate(part_paths):
+            with open(path, 'rb') as part:
+                header = part.readline()
+                if i == 0:
+                    output.write(header)
+                shutil.copyfileobj(part, output)
+            os.remove(path)
+
+def concat_parquet_parts(table, part_paths, compression='zstd'):
+    """
+    Склеивает Parquet-части в {table}.parquet в порядке ключа: группы строк частей
+    переписываются по одной, поэтому в памяти не больше одной группы. Части удаляются после склейки.
+    """
+    import pyarrow.parquet as pq
+
+    schema = pq.read_schema(part_paths[0])
+    with pq.ParquetWriter(f'{table}.parquet', schema,
+                          compression=None if compression == 'none' else compression) as writer:
+        for path in part_paths:
+            part = pq.ParquetFile(path)
+            for index in range(part.num_row_groups):
+                writer.write_table(part.read_row_group(index))
+            part.close()
+            os.remove(path)
+
+def export_table_sharded(table, shards=4, batch_size=BATCH_SIZE, concat=True, output_format='csv',
+                         compression='zstd', row_group_size=100000):
+    """
+    Параллельный экспорт одной большой таблицы: диапазоны первичного ключа выгружаются
+    keyset-предикатами (WHERE key >= low AND key < high, без OFFSET) на отдельных
+    соединениях с общим снимком, каждый диапазон — в свой файл {table}.partNNN.csv
+    (или .parquet). При concat=True части склеиваются в {table}.csv ({table}.parquet) по порядку.
+    """
+    connections = open_snapshot_connections(shards)
+    key = PRIMARY_KEYS[table]
+    ranges = key_ranges(connections[0], table, shards)
+    parquet = (parquet_options(connections[0], compression, row_group_size)
+               if output_format == 'parquet' else None)
+    extension = 'parquet' if parquet else 'csv'
+    part_paths = [f'{table}.part{i:03d}.{extension}' for i in range(len(ranges))]
+
+    def worker(connection, key_range, path):
+        cursor = connection.cursor(buffered=False)
+        where = f"WHERE {key} >= %s AND {key} < %s ORDER BY {key}"
+        if parquet:
+            count = export_table_parquet(cursor, table, batch_size, **parquet,
+                                         where=where, params=key_range, path=path)
+        else:
+            count = export_table_stream(cursor, table, batch_size, where=where,
+                                        params=key_range, path=path, encoding='utf-8')
+        cursor.close()
+        print(f'Диапазон {key} [{key_range[0]}, {key_range[1]}) таблицы {table} экспортирован в {path} ({count} строк)')
+        return count
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(connections)) as executor:
+            futures = [executor.submit(worker, connection, key_range, path)
+                       for connection, key_range, path in zip(connections, ranges, part_paths)]
+            total = sum(future.result() for future in futures)
+    finally:
+        for connection in connections:
+            if connection.is_connected():
+                connection.rollback()
+                connection.close()
+
+    if concat and part_paths:
+        if parquet:
+            concat_parquet_parts(table, part_paths, compression)
+        else:
+            concat_parts(table, part_paths)
+        print(f'Таблица {table} экспортирована в {table}.{extension} ({total} строк)')
+    return total
+
+def load_watermarks():
+    if not os.path.exists(WATERMARK_FILE):
+        return {}
+    with open(WATERMARK_FILE, encoding='utf-8') as f:
+        return json.load(f)
+
+def save_watermarks(watermarks):
+    # Запись через временный файл: прерванный запуск не портит сохраненные знаки
+    with open(f'{WATERMARK_FILE}.tmp', 'w', encoding='utf-8') as f:
+        json.dump(watermarks, f, ensure_ascii=False, indent=2)
+    os.replace(f'{WATERMARK_FILE}.tmp', WATERMARK_FILE)
+
+def check_watermark_columns(cursor):
+    """Проверяет, что столбцы WATERMARK_COLUMNS есть в базе: без них изменения строк не отследить"""
+    cursor.execute(
+        "SELECT table_name, column_name FROM information_schema.columns WHERE table_schema = %s",
+        (DB_CONFIG['database'],)
+    )
+    present = {(table, column) for table, column in cursor.fetchall()}
+    missing = [f'{table}.{column}' for table, column in WATERMARK_COLUMNS.items() if (table, column) not in present]
+    if missing:
+        raise ValueError(
+            f"В базе нет столбцов-водяных знаков {', '.join(missing)}: изменения строк этих таблиц "
+            "инкрементальный экспорт не увидит. Добавьте их (ALTER TABLE ... ADD COLUMN updated_at DATETIME(6) "
+            "NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6), как в "
+            "create_educational_institution.sql) или выгружайте таблицы целиком"
+        )
+
+def overlap_bound(table, column, low):
+    """Нижняя граница дельты: сохраненный знак минус окно повторного чтения"""
+    if column == PRIMARY_KEYS[table]:
+        return low - OVERLAP_KEYS
+    return (datetime.fromisoformat(low) - timedelta(seconds=OVERLAP_SECONDS)).isoformat(sep=' ')
+
+def claim_delta_path(table, run_id):
+    """
+    Создает пустой файл дельты deltas/{table}/{run_id}-NNN.csv с O_EXCL: запуски в одну
+    секунду получают разные номера, а имена сортируются в порядке запусков
+    """
+    os.makedirs(os.path.join(DELTA_DIR, table), exist_ok=True)
+    for number in itertools.count():
+        path = os.path.join(DELTA_DIR, table, f'{run_id}-{number:03d}.csv')
+        try:
+            open(path, 'x').close()
+            return path
+        except FileExistsError:
+            continue
+
+def export_tables_incremental(batch_size=BATCH_SIZE):
+    """
+    Инкрементальный экспорт: для каждой таблицы выгружаются строки с водяным знаком
+    (WATERMARK_COLUMNS или первичный ключ) больше сохраненного минус окно повторного чтения
+    и не больше максимума в текущем снимке, в файл deltas/{table}/{время запуска}-NNN.csv.
+    Таблица без сохраненного знака выгружается целиком (включая строки с NULL в столбце-знаке)
+    в {table}.csv — это базовый снимок для compact_tables. Знак хранится вместе с именем
+    столбца; знак None означает, что базовый снимок есть, но заполненных значений в нем не было.
+    Все таблицы читаются в одной транзакции WITH CONSISTENT SNAPSHOT.
+    """
+    watermarks = load_watermarks()
+    run_id = datetime.now().strftime('%Y%m%d%H%M%S')
+    connection = mysql.connector.connect(**DB_CONFIG)
+    try:
+        cursor = connection.cursor()
+        check_watermark_columns(cursor)
+        cursor.execute("SET SESSION TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+        cursor.execute("START TRANSACTION WITH CONSISTENT SNAPSHOT, READ ONLY")
+
+        for table in TABLES:
+            column = WATERMARK_COLUMNS.get(table, PRIMARY_KEYS[table])
+            cursor.execute(f"SELECT MAX({column}), COUNT(*) FROM {table}")
+            high, rows = cursor.fetchone()
+            if not rows:
+                continue
+            high = high.isoformat(sep=' ') if isinstance(high, datetime) else high
+            # Знак, сохраненный для другого столбца (прежняя версия схемы знаков), не сравним
+            # с текущим: таблица выгружается базовым снимком заново
+            saved = watermarks.get(table)
+            has_base = isinstance(saved, dict) and saved.get('column') == column
+
+            if not has_base:
+                stream_cursor = connection.cursor(buffered=False)
+                count = export_table_stream(
+                    stream_cursor, table, batch_size,
+                    where=f"WHERE ({column} <= %s OR {column} IS NULL) ORDER BY {PRIMARY_KEYS[table]}",
+                    params=(high,)
+                )
+                stream_cursor.close()
+                print(f'Таблица {table}: базовый снимок {table}.csv ({count} строк)')
+            elif high is None:
+                # Заполненных знаков по-прежнему нет: новых строк после базового снимка нет
+                continue
+            else:
+                low = saved['value']
+                if low is None:
+                    # В базовом снимке заполненных знаков не было: новые — все строки со знаком
+                    where, params = f"WHERE {column} IS NOT NULL AND {column} <= %s", (high,)
+                else:
+                    where, params = f"WHERE {column} > %s AND {column} <= %s", (overlap_bound(table, column, low), high)
+                path = claim_delta_path(table, run_id)
+                stream_cursor = connection.cursor(buffered=False)
+                count = export_table_stream(
+                    stream_cursor, table, batch_size,
+                    where=f"{where} ORDER BY {PRIMARY_KEYS[table]}", params=params, path=path
+                )
+                stream_cursor.close()
+                print(f'Таблица {table}: {count} новых/измененных строк в {path}')
+            watermarks[table] = {'column': column, 'value': high}
+
+        connection.rollback()
+        cursor.close()
+        save_watermarks(watermarks)
+    finally:
+        connection.close()
+
+def compact_table(table):
+    """
+    Слияние дельт таблицы в базовый снимок {table}.csv. Строки дельт (день изменений)
+    держатся в памяти по первичному ключу, базовый снимок читается потоком: строка
+    заменяется своей последней версией из дельт, новые строки дописываются в конец
+    в порядке ключа. Имена слитых дельт дописываются в журнал COMPACTED_LOG, сами дельты удаляются.
+    """
+    delta_paths = sorted(glob.glob(os.path.join(DELTA_DIR, table, '*.csv')))
+    if not delta_paths or not os.path.exists(f'{table}.csv'):
+        return 0
+
+    changed = {}
+    for path in delta_paths:
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            reader = csv.reader(f)
+            next(reader)
+            for row in reader:
+                changed[int(row[0])] = row
+
+    with open(f'{table}.csv', newline='', encoding='utf-8-sig') as base, \
+            open(f'{table}.csv.tmp', 'w', newline='', encoding='utf-8-sig') as output:
+        reader = csv.reader(base)
+        writer = csv.writer(output, delimiter=',', quoting=csv.QUOTE_MINIMAL)
+        writer.writerow(next(reader))
+        for row in reader:
+            writer.writerow(changed.pop(int(row[0]), row))
+        for key in sorted(changed):
+            writer.writerow(changed[key])
+
+    os.replace(f'{table}.csv.tmp', f'{table}.csv')
+    with open(os.path.join(DELTA_DIR, table, COMPACTED_LOG), 'a', encoding='utf-8') as log:
+        log.writelines(f'{os.path.basename(path)}\n' for path in delta_paths)
+    for path in delta_paths:
+        os.remove(path)
+    print(f'Таблица {table}: слито дельт — {len(delta_paths)}')
+    return len(delta_paths)
+
+def compact_tables():
+    for table in TABLES:
+        compact_table(table)
+
+def export_tables_to_csv(stream=False, batch_size=BATCH_SIZE, output_format='csv',
+                         compression='zstd', row_group_size=100000):
+    connection = None
     try:
         # Подключение к базе данных
         connection = mysql.connector.connect(**DB_CONFIG)
+
+        if stream or output_format == 'parquet':
+            parquet = (parquet_options(connection, compression, row_group_size)
+                       if output_format == 'parquet' else None)
+            # Небуферизованный курсор: результат читается с сервера по мере fetchmany
+            cursor = connection.cursor(buffered=False)
+            for table in TABLES:
+                count, path = export_table(cursor, table, batch_size, parquet)
+                print(f'Таблица {table} экспортирована в {path} ({count} строк)')
+            return
+
         cursor = connection.cursor()
 
         for table in TABLES:
@@ -49,10 +501,68 @@ def export_tables_to_csv():
     except Error as e:
         print(f'Ошибка подключения к MySQL: {e}')
     finally:
-        if connection.is_connected():
+        if connection is not None and connection.is_connected():
             cursor.close()
             connection.close()
             print('Соединение с базой данных закрыто')
 
+def parse_args():
+    parser = argparse.ArgumentParser(description='Экспорт таблиц базы данных в CSV')
+    parser.add_argument('--stream', action='store_true',
+                        help='Потоковый экспорт пачками через небуферизованный курсор')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                        help='Размер пачки строк в потоковом режиме')
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv',
+                        help='Формат файлов (parquet — всегда потоково, типы столбцов из схемы MySQL)')
+    parser.add_argument('--compression', default='zstd',
+                        help='Сжатие Parquet: zstd, snappy, gzip, brotli, lz4, none')
+    parser.add_argument('--row-group-size', type=int, default=100000,
+                        help='Строк в группе строк Parquet')
+    parser.add_argument('--workers', type=int, default=0,
+                        help='Число параллельных соединений с общим снимком (0 — последовательный экспорт)')
+    parser.add_argument('--shard-table', choices=TABLES,
+                        help='Экспортировать одну таблицу параллельно по диапазонам первичного ключа')
+    parser.add_argument('--shards', type=int, default=4,
+                        help='Число диапазонов (и соединений) для --shard-table')
+    parser.add_argument('--keep-parts', action='store_true',
+                        help='Не склеивать части --shard-table в один файл')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Экспорт только новых/измененных строк с сохранением водяных знаков')
+    parser.add_argument('--compact', action='store_true',
+                        help='Слить накопленные дельты в базовые снимки {table}.csv')
+    args = parser.parse_args()
+    # Дельты и их слияние построены на CSV: Parquet для них не поддерживается
+    if args.format == 'parquet' and (args.incremental or args.compact):
+        parser.error('--incremental и --compact работают только с --format csv')
+    return args
+
 if __name__ == '__main__':
-    export_tables_to_csv()
+    args = parse_args()
+    if args.compact:
+        compact_tables()
+    elif args.incremental:
+        try:
+            export_tables_incremental(batch_size=args.batch_size)
+        except Error as e:
+            print(f'Ошибка подключения к MySQL: {e}')
+        except ValueError as e:
+            print(f'Ошибка инкрементального экспорта: {e}')
+    elif args.shard_table:
+        try:
+            export_table_sharded(args.shard_table, shards=args.shards,
+                                 batch_size=args.batch_size, concat=not args.keep_parts,
+                                 output_format=args.format, compression=args.compression,
+                                 row_group_size=args.row_group_size)
+        except Error as e:
+            print(f'Ошибка подключения к MySQL: {e}')
+    elif args.workers > 0:
+        try:
+            export_tables_parallel(workers=args.workers, batch_size=args.batch_size,
+                                   output_format=args.format, compression=args.compression,
+                                   row_group_size=args.row_group_size)
+        except Error as e:
+            print(f'Ошибка подключения к MySQL: {e}')
+    else:
+        export_tables_to_csv(stream=args.stream, batch_size=args.batch_size,
+                             output_format=args.format, compression=args.compression,
+                             row_group_size=args.row_group_size)